@@ -0,0 +1,120 @@
+import json
+import logging
+import queue
+import random
+import sys
+import time
+from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener
+
+from .config import settings
+
+access_logger = logging.getLogger("app.access")
+
+# Felder des aktuellen Requests; wird von der Middleware gesetzt und über
+# Worker-Threads hinweg (contextvars) von Endpoint und Loader ergänzt
+request_context = ContextVar("request_context", default=None)
+
+_listener = None
+_queue_handler = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Serialisiert die Felder eines Access-Log-Eintrags als eine JSON-Zeile"""
+
+    def format(self, record):
+        entry = {
+            "timestamp": self.formatTime(record, "%Y-%m-%dT%H:%M:%S") + f".{int(record.msecs):03d}",
+            "level": record.levelname,
+            "logger": record.name
+        }
+        entry.update(getattr(record, "fields", None) or {"message": record.getMessage()})
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def setup_access_logging():
+    """Hängt einen QueueHandler an; serialisiert und geschrieben wird in einem eigenen Thread"""
+    global _listener, _queue_handler
+    if _listener is not None or not settings.ACCESS_LOG_ENABLED:
+        return
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(JsonFormatter())
+    _queue_handler = QueueHandler(log_queue)
+    access_logger.addHandler(_queue_handler)
+    access_logger.setLevel(logging.INFO)
+    access_logger.propagate = False
+    _listener = QueueListener(log_queue, stream_handler)
+    _listener.start()
+
+
+def shutdown_access_logging():
+    global _listener, _queue_handler
+    if _listener is not None:
+        access_logger.removeHandler(_queue_handler)
+        _listener.stop()
+        _listener, _queue_handler = None, None
+
+
+def note(**fields):
+    """Ergänzt Felder des Access-Log-Eintrags für den aktuellen Request"""
+    context = request_context.get()
+    if context is not None:
+        context.update(fields)
+
+
+def note_cache_hit(hit):
+    """cache_hit bleibt nur wahr, wenn alle Transcripts des Requests aus dem Cache kamen"""
+    context = request_context.get()
+    if context is not None:
+        context["cache_hit"] = context.get("cache_hit", True) and hit
+
+
+def count_upstream_call(duration):
+    """Zählt einen YouTube-Aufruf und dessen Dauer für den aktuellen Request"""
+    context = request_context.get()
+    if context is not None:
+        context["upstream_calls"] = context.get("upstream_calls", 0) + 1
+        context["upstream_ms"] = round(context.get("upstream_ms", 0.0) + duration * 1000, 1)
+
+
+def _should_log(fields):
+    # Fehler und langsame Requests immer, alles andere gesampelt
+    if fields.get("status", 500) >= 400 or "error" in fields:
+        return True
+    if fields["duration_ms"] >= settings.ACCESS_LOG_SLOW_THRESHOLD * 1000:
+        return True
+    return random.random() < settings.ACCESS_LOG_SAMPLE_RATE
+
+
+class AccessLogMiddleware:
+    """ASGI-Middleware, die pro Request einen strukturierten Log-Eintrag erzeugt"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or _listener is None:
+            await self.app(scope, receive, send)
+            return
+
+        fields = {"method": scope["method"], "path": scope["path"]}
+        token = request_context.set(fields)
+        started = time.perf_counter()
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                fields["status"] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        except Exception as e:
+            fields.setdefault("status", 500)
+            fields["error"] = type(e).__name__
+            raise
+        finally:
+            request_context.reset(token)
+            fields["duration_ms"] = round((time.perf_counter() - started) * 1000, 1)
+            if _should_log(fields):
+                access_logger.info("request", extra={"fields": fields})
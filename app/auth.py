@@ -10,4 +10,17 @@ async def get_api_key(api_key: str = Security(api_key_header)):
     raise HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Ungültiger API-Key"
-    ) 
\ No newline at end of file
+    )
+
+async def get_admin_api_key(api_key: str = Security(api_key_header)):
+    if not settings.ADMIN_API_KEY:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin-Endpunkte sind deaktiviert (ADMIN_API_KEY nicht gesetzt)"
+        )
+    if api_key == settings.ADMIN_API_KEY:
+        return api_key
+    raise HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Ungültiger Admin-API-Key"
+    )
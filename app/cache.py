@@ -0,0 +1,191 @@
+import struct
+import sys
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+
+from .config import settings
+
+# video_id-Länge, language-Länge, Pufferlänge, Anzahl Segmente
+SERIALIZED_HEADER = struct.Struct("<IIII")
+
+
+def _little_endian(values):
+    # Serialisierte Arrays sind immer little-endian; auf big-endian-Hosts umdrehen
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values
+
+
+class CompactTranscript:
+    """Speicherschonende Darstellung eines Transcripts.
+
+    Alle Segmenttexte liegen hintereinander (mit "\\n" verbunden) in einem
+    einzigen UTF-8-Puffer. Statt einer Liste von Dicts pro Segment werden nur
+    Byte-Offsets sowie Start- und Dauerwerte in flachen Arrays gehalten.
+    """
+
+    __slots__ = ("video_id", "language", "_buffer", "_offsets", "starts", "durations")
+
+    def __init__(self, video_id, language, buffer, offsets, starts, durations):
+        self.video_id = video_id
+        self.language = language
+        self._buffer = buffer
+        # offsets hat len(segments) + 1 Einträge; Segment i liegt in
+        # buffer[offsets[i]:offsets[i + 1] - 1] (das -1 überspringt das "\n")
+        self._offsets = offsets
+        self.starts = starts
+        self.durations = durations
+
+    @classmethod
+    def from_segments(cls, video_id, language, segments):
+        """Erzeugt die kompakte Form aus der Segmentliste von youtube_transcript_api"""
+        offsets = array("Q", [0])
+        starts = array("d")
+        durations = array("d")
+        parts = []
+        position = 0
+        for entry in segments:
+            encoded = entry["text"].encode("utf-8")
+            parts.append(encoded)
+            position += len(encoded) + 1
+            offsets.append(position)
+            starts.append(float(entry.get("start", 0.0)))
+            durations.append(float(entry.get("duration", 0.0)))
+        return cls(video_id, language, b"\n".join(parts), offsets, starts, durations)
+
+    def to_bytes(self):
+        """Serialisiert in ein kompaktes Binärformat (z. B. für den geteilten Cache)"""
+        video_id = self.video_id.encode("utf-8")
+        language = self.language.encode("utf-8")
+        header = SERIALIZED_HEADER.pack(len(video_id), len(language), len(self._buffer), len(self))
+        return b"".join((
+            header, video_id, language, self._buffer,
+            _little_endian(self._offsets).tobytes(),
+            _little_endian(self.starts).tobytes(),
+            _little_endian(self.durations).tobytes()
+        ))
+
+    @classmethod
+    def from_bytes(cls, data):
+        video_id_size, language_size, buffer_size, count = SERIALIZED_HEADER.unpack_from(data)
+        position = SERIALIZED_HEADER.size
+        video_id = data[position:position + video_id_size].decode("utf-8")
+        position += video_id_size
+        language = data[position:position + language_size].decode("utf-8")
+        position += language_size
+        buffer = bytes(data[position:position + buffer_size])
+        position += buffer_size
+        arrays = []
+        for typecode, size in (("Q", count + 1), ("d", count), ("d", count)):
+            values = array(typecode)
+            end = position + values.itemsize * size
+            values.frombytes(data[position:end])
+            arrays.append(_little_endian(values))
+            position = end
+        return cls(video_id, language, buffer, *arrays)
+
+    def __len__(self):
+        return len(self.starts)
+
+    @property
+    def text(self):
+        """Das komplette Transcript als mit "\\n" verbundener String"""
+        return self._buffer.decode("utf-8")
+
+    def segment_text(self, index):
+        return self._buffer[self._offsets[index]:self._offsets[index + 1] - 1].decode("utf-8")
+
+    def text_range(self, first, last):
+        """Verbundener Text der Segmente first..last-1 ohne Zwischenobjekte pro Segment"""
+        if first >= last:
+            return ""
+        return self._buffer[self._offsets[first]:self._offsets[last] - 1].decode("utf-8")
+
+    def index_range(self, start=None, end=None):
+        """Segmentindizes [first, last) für das Zeitfenster [start, end) in Sekunden.
+
+        Nutzt Binärsuche über die sortierten Startzeiten; ein Segment, das vor
+        start beginnt, aber noch hineinreicht, wird mitgenommen.
+        """
+        first = 0
+        last = len(self)
+        if start is not None:
+            first = bisect_right(self.starts, start) - 1
+            if first < 0 or self.starts[first] + self.durations[first] <= start:
+                first += 1
+        if end is not None:
+            last = bisect_left(self.starts, end)
+        return first, max(first, last)
+
+    def iter_segments(self, first=0, last=None):
+        """Liefert (start, duration, text) für die Segmente first..last-1"""
+        last = len(self) if last is None else last
+        for index in range(first, last):
+            yield self.starts[index], self.durations[index], self.segment_text(index)
+
+    def nbytes(self):
+        """Ungefährer Speicherbedarf der Nutzdaten in Bytes"""
+        return (
+            len(self._buffer)
+            + self._offsets.itemsize * len(self._offsets)
+            + self.starts.itemsize * len(self.starts)
+            + self.durations.itemsize * len(self.durations)
+        )
+
+
+class TranscriptCache:
+    """Thread-sicherer LRU-Cache mit optionaler Lebensdauer (ttl in Sekunden)"""
+
+    def __init__(self, max_entries, ttl=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires is not None and expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        if self.max_entries <= 0:
+            return
+        expires = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def nbytes(self):
+        """Speicherbedarf aller gecachten CompactTranscripts in Bytes"""
+        with self._lock:
+            values = [value for _, value in self._entries.values()]
+        return sum(value.nbytes() for value in values)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+transcript_cache = TranscriptCache(settings.CACHE_MAX_ENTRIES)
+# Ergebnisse von list_transcripts (verfügbare Sprachen pro Video)
+listing_cache = TranscriptCache(settings.LISTING_CACHE_MAX_ENTRIES, ttl=settings.LISTING_CACHE_TTL)
+# Permanente Fehler pro Video (z. B. Transcripts deaktiviert) für kurze Zeit
+negative_cache = TranscriptCache(settings.NEGATIVE_CACHE_MAX_ENTRIES, ttl=settings.NEGATIVE_CACHE_TTL)
+# Ergebnisse der Nachbearbeitungs-Pipeline (bereinigtes Transcript und Chunks)
+pipeline_cache = TranscriptCache(settings.CACHE_MAX_ENTRIES)
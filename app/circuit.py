@@ -0,0 +1,68 @@
+import threading
+import time
+
+from .config import settings
+
+
+class CircuitBreaker:
+    """Einfacher Circuit Breaker für Upstream-Aufrufe.
+
+    Nach failure_threshold aufeinanderfolgenden Fehlern wird der Kreis
+    geöffnet und Aufrufe werden sofort abgelehnt. Nach reset_timeout Sekunden
+    wird genau ein Probeaufruf zugelassen (half_open); gelingt er, schließt
+    der Kreis wieder. Bis zu seinem Ergebnis bleiben weitere Aufrufe abgelehnt.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold, reset_timeout):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+        # Startzeit des laufenden Probeaufrufs (None, wenn keiner läuft)
+        self._probe_started_at = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self._opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def allow(self):
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            now = time.monotonic()
+            if now - self._opened_at < self.reset_timeout:
+                return False
+            # Ein hängengebliebener Probeaufruf gibt den Platz nach reset_timeout frei
+            if self._probe_started_at is not None and now - self._probe_started_at < self.reset_timeout:
+                return False
+            self._probe_started_at = now
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probe_started_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._probe_started_at = None
+            if self._failures >= self.failure_threshold or self._opened_at is not None:
+                # Auch ein fehlgeschlagener Probeaufruf öffnet den Kreis erneut
+                self._opened_at = time.monotonic()
+
+    def as_dict(self):
+        return {"state": self.state, "failures": self._failures}
+
+
+upstream_breaker = CircuitBreaker(settings.BREAKER_FAILURE_THRESHOLD, settings.BREAKER_RESET_TIMEOUT)
@@ -4,5 +4,67 @@ from typing import Optional
 class Settings:
     API_KEY: str = os.getenv("API_KEY", "dein-geheimer-api-key")
     API_KEY_NAME: str = "X-API-Key"
+    # Separater Schlüssel für Admin-Endpunkte; ohne Schlüssel sind sie deaktiviert
+    ADMIN_API_KEY: str = os.getenv("ADMIN_API_KEY", "")
+
+    # Maximale Anzahl gecachter Transcripts (0 deaktiviert den Cache)
+    CACHE_MAX_ENTRIES: int = int(os.getenv("CACHE_MAX_ENTRIES", "1000"))
+    # Cache für verfügbare Sprachen (list_transcripts) mit Lebensdauer in Sekunden
+    LISTING_CACHE_MAX_ENTRIES: int = int(os.getenv("LISTING_CACHE_MAX_ENTRIES", "5000"))
+    LISTING_CACHE_TTL: int = int(os.getenv("LISTING_CACHE_TTL", "3600"))
+    # Negativ-Cache für Videos ohne Transcripts (deaktiviert, nicht verfügbar)
+    NEGATIVE_CACHE_MAX_ENTRIES: int = int(os.getenv("NEGATIVE_CACHE_MAX_ENTRIES", "5000"))
+    NEGATIVE_CACHE_TTL: int = int(os.getenv("NEGATIVE_CACHE_TTL", "600"))
+
+    # Transcript-Quelle: "youtube" oder "fixtures" (JSON-Dateien in FIXTURE_DIR)
+    TRANSCRIPT_BACKEND: str = os.getenv("TRANSCRIPT_BACKEND", "youtube")
+    FIXTURE_DIR: str = os.getenv("FIXTURE_DIR", "fixtures")
+    # Vorgeschaltete Schichten in der Reihenfolge Cache → Shared → Store → Backend
+    TRANSCRIPT_LAYERS: str = os.getenv("TRANSCRIPT_LAYERS", "cache,shared,store")
+
+    # Geteilter Cache für mehrere Knoten: redis://host:6379/0 oder memory:// (lokaler Ersatz);
+    # leer deaktiviert die Schicht
+    SHARED_CACHE_URL: str = os.getenv("SHARED_CACHE_URL", "")
+    SHARED_CACHE_TTL: float = float(os.getenv("SHARED_CACHE_TTL", "86400"))
+    # Sprachlisten ändern sich (neue Untertitel, Übersetzungen) und leben kürzer als Transcripts
+    SHARED_CACHE_LISTING_TTL: float = float(os.getenv("SHARED_CACHE_LISTING_TTL", str(LISTING_CACHE_TTL)))
+    # Maximale Haltezeit der Single-Flight-Sperre in Sekunden
+    SHARED_CACHE_LOCK_TIMEOUT: float = float(os.getenv("SHARED_CACHE_LOCK_TIMEOUT", "30"))
+    # Lebensdauer der Fehlermarke, mit der wartende Knoten einen fehlgeschlagenen Abruf übernehmen
+    SHARED_CACHE_ERROR_TTL: float = float(os.getenv("SHARED_CACHE_ERROR_TTL", "5"))
+
+    # Worker für blockierende Transcript-Abrufe
+    FETCH_WORKERS: int = int(os.getenv("FETCH_WORKERS", "8"))
+
+    # Circuit Breaker für YouTube: Fehler in Folge bis zum Öffnen, Sekunden bis zum Probeaufruf
+    BREAKER_FAILURE_THRESHOLD: int = int(os.getenv("BREAKER_FAILURE_THRESHOLD", "5"))
+    BREAKER_RESET_TIMEOUT: float = float(os.getenv("BREAKER_RESET_TIMEOUT", "30"))
+
+    # Readiness: Messintervall und Grenzwerte für Event-Loop-Lag (Sekunden) und Warteschlange
+    LOOP_MONITOR_INTERVAL: float = float(os.getenv("LOOP_MONITOR_INTERVAL", "0.5"))
+    # Debug-Modus: Stack-Traces loggen, wenn der Loop länger als LOOP_BLOCK_THRESHOLD Sekunden blockiert
+    LOOP_BLOCK_DEBUG: bool = os.getenv("LOOP_BLOCK_DEBUG", "false").lower() in ("1", "true", "yes")
+    LOOP_BLOCK_THRESHOLD: float = float(os.getenv("LOOP_BLOCK_THRESHOLD", "0.1"))
+    READY_MAX_LOOP_LAG: float = float(os.getenv("READY_MAX_LOOP_LAG", "0.5"))
+    READY_MAX_QUEUE: int = int(os.getenv("READY_MAX_QUEUE", "32"))
+
+    # SQLite-Datei für abgerufene Transcripts und den Volltext-Index
+    STORE_PATH: str = os.getenv("STORE_PATH", "transcripts.db")
+
+    # Strukturiertes Access-Log (JSON): Sampling-Rate für erfolgreiche Requests;
+    # Fehler und Requests über ACCESS_LOG_SLOW_THRESHOLD Sekunden werden immer geloggt
+    ACCESS_LOG_ENABLED: bool = os.getenv("ACCESS_LOG_ENABLED", "true").lower() in ("1", "true", "yes")
+    ACCESS_LOG_SAMPLE_RATE: float = float(os.getenv("ACCESS_LOG_SAMPLE_RATE", "1.0"))
+    ACCESS_LOG_SLOW_THRESHOLD: float = float(os.getenv("ACCESS_LOG_SLOW_THRESHOLD", "1.0"))
+
+    # Cache-Warm-up beim Start: kommagetrennte Video-IDs und/oder die
+    # WARMUP_TOP_N meistabgerufenen Videos aus dem Zugriffslog
+    WARMUP_VIDEO_IDS: str = os.getenv("WARMUP_VIDEO_IDS", "")
+    WARMUP_TOP_N: int = int(os.getenv("WARMUP_TOP_N", "0"))
+    WARMUP_CONCURRENCY: int = int(os.getenv("WARMUP_CONCURRENCY", "4"))
+    # Maximal gestartete Abrufe pro Sekunde
+    WARMUP_RATE: float = float(os.getenv("WARMUP_RATE", "2"))
+    # Abrufe werden im Speicher gezählt und alle ACCESS_FLUSH_INTERVAL Sekunden ins Zugriffslog geschrieben
+    ACCESS_FLUSH_INTERVAL: float = float(os.getenv("ACCESS_FLUSH_INTERVAL", "10"))
     
 settings = Settings() 
\ No newline at end of file
@@ -1,73 +1,198 @@
-from youtube_transcript_api import YouTubeTranscriptApi
-from youtube_transcript_api._errors import TranscriptsDisabled, NoTranscriptFound
+import asyncio
+
+from ..access_log import note
+from ..cache import pipeline_cache
+from ..errors import InvalidVideoUrlError, TranscriptNotFoundError
+from ..pipeline import chunk, run_pipeline
+from ..sources import transcript_source
+from ..subtitles import SUBTITLE_WRITERS
 
 
 class LoadTranscript:
-    def __init__(self, url, language_codes=None):
+    def __init__(self, url, language_codes=None, multi_language=False, source=None,
+                 postprocess=None, chunk_tokens=None, chunk_overlap=0):
         self.url = url
         # Fallback-Sprachen: Deutsch, Englisch, dann alle verfügbaren
         self.language_codes = language_codes or ['de', 'en']
+        # Alle angefragten Sprachen statt nur der ersten verfügbaren liefern
+        self.multi_language = multi_language
+        # Quelle (Standard: konfigurierte Kette Cache → Store → Backend)
+        self.source = source or transcript_source
+        # Optionale Nachbearbeitung (Stufen aus app.pipeline) und Chunking
+        self.postprocess = tuple(postprocess or ())
+        self.chunk_tokens = chunk_tokens
+        self.chunk_overlap = chunk_overlap
 
-    def run(self):
-        video_id = self.url.split("v=")[1]
-        
+    def video_id(self):
         try:
-            # Versuche zuerst mit bevorzugten Sprachen
-            transcript = YouTubeTranscriptApi.get_transcript(video_id, languages=self.language_codes)
-            full_text = "\n".join([entry['text'] for entry in transcript])
-            used_language = self._get_used_language(video_id)
-            
-            return {
-                "transcript": full_text,
-                "language": used_language,
-                "video_id": video_id
+            return self.url.split("v=")[1]
+        except IndexError:
+            raise InvalidVideoUrlError()
+
+    async def run(self, start=None, end=None, offset=None, limit=None,
+                  char_offset=None, char_limit=None, include_segments=False):
+        video_id = self.video_id()
+        note(video_id=video_id)
+        slice_args = (start, end, offset, limit, char_offset, char_limit, include_segments)
+
+        if not self.multi_language:
+            compact, chunks = await self._process(await self.load(video_id))
+            return self._slice(compact, video_id, *slice_args, chunks)
+
+        results = []
+        for compact in await self.load_all(video_id):
+            processed, chunks = await self._process(compact)
+            results.append(self._slice(processed, video_id, *slice_args, chunks))
+        result = dict(results[0])
+        result["transcripts"] = [
+            {
+                "language": entry["language"],
+                "transcript": entry["transcript"],
+                "total_segments": entry["total_segments"],
+                "next_offset": entry["next_offset"],
+                "next_char_offset": entry.get("next_char_offset"),
+                "segments": entry.get("segments"),
+                "chunks": entry.get("chunks")
             }
-            
-        except NoTranscriptFound:
-            # Falls keine bevorzugten Sprachen verfügbar sind, nimm die erste verfügbare
-            try:
-                transcript_list = YouTubeTranscriptApi.list_transcripts(video_id)
-                # Nimm das erste verfügbare Transcript
-                transcript = transcript_list.find_transcript([]).fetch()
-                full_text = "\n".join([entry['text'] for entry in transcript])
-                
-                return {
-                    "transcript": full_text,
-                    "language": "auto-detected",
-                    "video_id": video_id
-                }
-            except Exception as e:
-                # Liste verfügbare Sprachen für bessere Fehlermeldung
-                available_languages = self._get_available_languages(video_id)
-                raise Exception(f"Kein Transcript verfügbar. Verfügbare Sprachen: {available_languages}")
-        
-        except TranscriptsDisabled:
-            raise Exception("Transcripts sind für dieses Video deaktiviert")
-        
-        except Exception as e:
-            raise Exception(f"Fehler beim Abrufen des Transcripts: {str(e)}")
-    
-    def _get_used_language(self, video_id):
-        """Ermittelt die verwendete Sprache"""
-        try:
-            transcript_list = YouTubeTranscriptApi.list_transcripts(video_id)
-            for language_code in self.language_codes:
-                try:
-                    transcript = transcript_list.find_transcript([language_code])
-                    return f"{language_code} ({transcript.language})"
-                except:
-                    continue
-            return "unbekannt"
-        except:
-            return "unbekannt"
-    
-    def _get_available_languages(self, video_id):
-        """Liste verfügbare Sprachen für bessere Fehlermeldung"""
-        try:
-            transcript_list = YouTubeTranscriptApi.list_transcripts(video_id)
-            languages = []
-            for transcript in transcript_list:
-                languages.append(f"{transcript.language_code} ({transcript.language})")
-            return languages
-        except:
-            return ["Keine verfügbar"]
\ No newline at end of file
+            for entry in results
+        ]
+        return result
+
+    async def subtitles(self, subtitle_format, start=None, end=None, offset=None, limit=None):
+        """Liefert einen Generator, der das Transcript als SRT/WebVTT schreibt"""
+        video_id = self.video_id()
+        note(video_id=video_id)
+        compact, _ = await self._process(await self.load(video_id))
+        _, first, last, _ = self._segment_range(compact, start, end, offset, limit)
+        return video_id, SUBTITLE_WRITERS[subtitle_format](compact, first, last)
+
+    def _segment_range(self, compact, start, end, offset, limit):
+        # Zeitfenster per Binärsuche, danach Segment-Pagination
+        range_first, range_last = compact.index_range(start, end)
+        first = min(range_first + (offset or 0), range_last)
+        last = range_last if limit is None else min(range_last, first + limit)
+        return range_first, first, last, range_last
+
+    def _slice(self, compact, video_id, start, end, offset, limit,
+               char_offset, char_limit, include_segments, chunks=None):
+        range_first, first, last, range_last = self._segment_range(compact, start, end, offset, limit)
+        text = compact.text_range(first, last)
+
+        result = {
+            "transcript": text,
+            "language": compact.language,
+            "video_id": video_id,
+            "total_segments": range_last - range_first,
+            "next_offset": last - range_first if last < range_last else None
+        }
+
+        if char_offset is not None or char_limit is not None:
+            char_first = char_offset or 0
+            char_last = len(text) if char_limit is None else char_first + char_limit
+            result["transcript"] = text[char_first:char_last]
+            result["next_char_offset"] = char_last if char_last < len(text) else None
+
+        if include_segments:
+            result["segments"] = [
+                {"start": seg_start, "duration": duration, "text": seg_text}
+                for seg_start, duration, seg_text in compact.iter_segments(first, last)
+            ]
+        if chunks is not None:
+            result["chunks"] = chunks
+        return result
+
+    async def _process(self, compact):
+        """Wendet Nachbearbeitung und Chunking an (pro Video/Sprache/Optionen gecacht).
+
+        Liefert das bearbeitete CompactTranscript und die Chunks (oder None).
+        Chunks beziehen sich immer auf das vollständige Transcript.
+        """
+        if not self.postprocess and self.chunk_tokens is None:
+            return compact, None
+        cache_key = (compact.video_id, compact.language, self.postprocess,
+                     self.chunk_tokens, self.chunk_overlap)
+        cached = pipeline_cache.get(cache_key)
+        if cached is None:
+            # Bei langen Transcripts CPU-intensiv: außerhalb des Event-Loops rechnen
+            cached = await asyncio.to_thread(self._compute_pipeline, compact)
+            pipeline_cache.set(cache_key, cached)
+        return cached
+
+    def _compute_pipeline(self, compact):
+        processed = run_pipeline(compact, self.postprocess) if self.postprocess else compact
+        chunks = chunk(processed, self.chunk_tokens, self.chunk_overlap) if self.chunk_tokens else None
+        return processed, chunks
+
+    async def load(self, video_id):
+        """Liefert das Transcript als CompactTranscript aus der Quellen-Kette"""
+        tracks = await self.source.list_tracks(video_id)
+        compact = await self.source.fetch(video_id, self._select_track(tracks))
+        note(language=compact.language)
+        return compact
+
+    async def load_all(self, video_id):
+        """Liefert ein CompactTranscript pro angefragter Sprache.
+
+        Alle Sprachen teilen sich ein Listing; fehlende Sprachen werden, falls
+        möglich, als YouTube-Übersetzung geladen. Die Abrufe laufen parallel.
+        """
+        tracks = await self.source.list_tracks(video_id)
+        selected = [
+            self._select_language(tracks, language_code)
+            for language_code in dict.fromkeys(self.language_codes)
+        ]
+        compacts = await self.source.fetch_many(video_id, selected)
+        note(language=[compact.language for compact in compacts])
+        return compacts
+
+    def _select_track(self, tracks):
+        """Wählt die erste bevorzugte Sprache (manuelle vor automatisch generierten)"""
+        for language_code in self.language_codes:
+            for track in tracks:
+                if track.language_code == language_code:
+                    return track
+        # Falls keine bevorzugten Sprachen verfügbar sind, nimm die erste verfügbare
+        if tracks:
+            return tracks[0]
+        raise TranscriptNotFoundError("Kein Transcript verfügbar")
+
+    def _select_language(self, tracks, language_code):
+        """Spur für genau eine Sprache, notfalls als Übersetzung"""
+        for track in tracks:
+            if track.language_code == language_code:
+                return track
+        for track in tracks:
+            if not track.is_translatable:
+                continue
+            if any(t["language_code"] == language_code for t in track.translation_languages):
+                return track.translate(language_code)
+        available_languages = [track.label for track in tracks]
+        raise TranscriptNotFoundError(
+            f"Kein Transcript und keine Übersetzung für '{language_code}' verfügbar. "
+            f"Verfügbare Sprachen: {available_languages}"
+        )
+
+
+async def get_available_languages(video_id):
+    """Verfügbare Sprachen eines Videos (manuell/generiert, übersetzbar)"""
+    tracks = await transcript_source.list_tracks(video_id)
+
+    languages = []
+    translation_languages = {}
+    for track in tracks:
+        languages.append({
+            "language_code": track.language_code,
+            "language": track.language,
+            "is_generated": track.is_generated,
+            "is_translatable": track.is_translatable
+        })
+        for translation in track.translation_languages:
+            translation_languages[translation["language_code"]] = translation["language"]
+    return {
+        "video_id": video_id,
+        "languages": languages,
+        "translation_languages": [
+            {"language_code": code, "language": name}
+            for code, name in translation_languages.items()
+        ]
+    }
@@ -0,0 +1,65 @@
+import math
+
+from fastapi import status
+
+from .config import settings
+
+
+class TranscriptError(Exception):
+    """Basisklasse für erwartete Fehler beim Abrufen von Transcripts.
+
+    Jede Unterklasse legt den HTTP-Status und die Standardmeldung fest;
+    main.py wandelt sie über einen Exception-Handler in die Antwort um.
+    """
+
+    status_code = status.HTTP_400_BAD_REQUEST
+    detail = "Fehler beim Abrufen des Transcripts"
+    # Permanente Fehler werden negativ gecacht, damit Wiederholungen YouTube nicht erneut treffen
+    cacheable = False
+
+    def __init__(self, detail=None):
+        self.detail = detail or self.detail
+        super().__init__(self.detail)
+
+
+class InvalidVideoUrlError(TranscriptError):
+    status_code = status.HTTP_400_BAD_REQUEST
+    detail = "Ungültige YouTube-URL. Stellen Sie sicher, dass die URL einen 'v=' Parameter enthält."
+
+
+class TranscriptsDisabledError(TranscriptError):
+    status_code = status.HTTP_404_NOT_FOUND
+    detail = "Transcripts sind für dieses Video deaktiviert"
+    cacheable = True
+
+
+class TranscriptNotFoundError(TranscriptError):
+    status_code = status.HTTP_404_NOT_FOUND
+    detail = "Kein Transcript verfügbar"
+    cacheable = True
+
+
+class VideoUnavailableError(TranscriptError):
+    status_code = status.HTTP_404_NOT_FOUND
+    detail = "Das Video ist nicht verfügbar"
+    cacheable = True
+
+
+class UpstreamThrottledError(TranscriptError):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    detail = "YouTube ist vorübergehend nicht erreichbar, bitte später erneut versuchen"
+
+    @property
+    def retry_after(self):
+        # Frühestens nach dem Reset-Timeout lässt der Circuit Breaker wieder einen Aufruf zu
+        return math.ceil(settings.BREAKER_RESET_TIMEOUT)
+
+
+class UpstreamTimeoutError(TranscriptError):
+    status_code = status.HTTP_504_GATEWAY_TIMEOUT
+    detail = "Zeitüberschreitung beim Abruf von YouTube"
+
+
+class UpstreamError(TranscriptError):
+    status_code = status.HTTP_502_BAD_GATEWAY
+    detail = "Fehlerhafte Antwort von YouTube"
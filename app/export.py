@@ -0,0 +1,36 @@
+import json
+import zlib
+from datetime import datetime, timezone
+
+# Anzahl Dokumente, die pro Lesevorgang aus dem Store geholt werden
+EXPORT_BATCH_SIZE = 100
+
+
+def iter_jsonl_export(store, compress=True, batch_size=EXPORT_BATCH_SIZE):
+    """Schreibt den Transcript-Store als (gzip-komprimiertes) JSONL.
+
+    Pro Zeile ein Transcript mit video_id, language, fetched_at und
+    segments. Es wird batchweise gelesen und inkrementell komprimiert,
+    sodass nie der gesamte Store im Speicher liegt.
+    """
+    # wbits=31 erzeugt ein gzip-kompatibles Format
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+    lines = []
+    for count, document in enumerate(store.iter_documents(batch_size), 1):
+        document["fetched_at"] = datetime.fromtimestamp(
+            document["fetched_at"], tz=timezone.utc
+        ).isoformat()
+        lines.append(json.dumps(document, ensure_ascii=False))
+        lines.append("\n")
+        if count % batch_size == 0:
+            chunk = "".join(lines).encode("utf-8")
+            lines = []
+            chunk = compressor.compress(chunk) if compressor else chunk
+            if chunk:
+                yield chunk
+
+    chunk = "".join(lines).encode("utf-8")
+    if compressor:
+        chunk = compressor.compress(chunk) + compressor.flush()
+    if chunk:
+        yield chunk
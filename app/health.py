@@ -0,0 +1,181 @@
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+
+from .cache import transcript_cache
+from .circuit import CircuitBreaker, upstream_breaker
+from .config import settings
+from .warmup import warmup_state
+from .workers import fetch_pool, store_pool
+
+logger = logging.getLogger(__name__)
+
+
+class LoopLagMonitor:
+    """Misst fortlaufend die Verzögerung des Event-Loops.
+
+    Ein Hintergrund-Task schläft interval Sekunden; was er darüber hinaus
+    wartet, ist die Zeit, in der der Loop durch andere Callbacks blockiert war.
+    Im Debug-Modus prüft zusätzlich ein Watchdog-Thread, ob der Loop länger als
+    block_threshold hängt, und loggt dann den Stack des blockierenden Codes.
+    """
+
+    LAG_BUCKETS = (0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+    def __init__(self, interval=0.5, block_threshold=0.1, debug=False):
+        self.interval = interval
+        self.block_threshold = block_threshold
+        self.debug = debug
+        self.lag = 0.0
+        self.max_lag = 0.0
+        self.lag_sum = 0.0
+        self.lag_count = 0
+        self.lag_bucket_counts = [0] * len(self.LAG_BUCKETS)
+        self.blocked_count = 0
+        self._task = None
+        self._watchdog = None
+        self._stop_event = threading.Event()
+        self._loop_thread_id = None
+        self._expected_wake = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        # Im Debug-Modus feiner messen, damit kurze Blockaden auffallen
+        interval = min(self.interval, self.block_threshold / 2) if self.debug else self.interval
+        while True:
+            started = loop.time()
+            self._expected_wake = time.monotonic() + interval
+            await asyncio.sleep(interval)
+            self._record(max(0.0, loop.time() - started - interval))
+
+    def _record(self, lag):
+        self.lag = lag
+        self.max_lag = max(self.max_lag, lag)
+        self.lag_sum += lag
+        self.lag_count += 1
+        for index, bound in enumerate(self.LAG_BUCKETS):
+            if lag <= bound:
+                self.lag_bucket_counts[index] += 1
+                break
+
+    def _watch(self):
+        reported_wake = None
+        while not self._stop_event.wait(self.block_threshold / 4):
+            expected_wake = self._expected_wake
+            if expected_wake is None or expected_wake == reported_wake:
+                continue
+            blocked_for = time.monotonic() - expected_wake
+            if blocked_for < self.block_threshold:
+                continue
+            # Pro Blockade nur einmal melden
+            reported_wake = expected_wake
+            self.blocked_count += 1
+            frame = sys._current_frames().get(self._loop_thread_id)
+            stack = "".join(traceback.format_stack(frame)) if frame is not None else "<unbekannt>"
+            logger.warning(
+                "Event-Loop seit %.3fs blockiert, aktueller Stack:\n%s",
+                blocked_for, stack
+            )
+
+    def start(self):
+        if self._task is None:
+            self._loop_thread_id = threading.get_ident()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        if self.debug and self._watchdog is None:
+            self._stop_event.clear()
+            self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+            self._watchdog.start()
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if self._watchdog is not None:
+            self._stop_event.set()
+            self._watchdog = None
+
+    def as_dict(self):
+        return {
+            "lag": round(self.lag, 4),
+            "max_lag": round(self.max_lag, 4),
+            "blocked_count": self.blocked_count
+        }
+
+
+loop_monitor = LoopLagMonitor(
+    settings.LOOP_MONITOR_INTERVAL,
+    block_threshold=settings.LOOP_BLOCK_THRESHOLD,
+    debug=settings.LOOP_BLOCK_DEBUG
+)
+
+
+def readiness_report():
+    """Bereitschaft anhand von Warm-up, Loop-Lag und Warteschlange.
+
+    Der Circuit Breaker wird nur berichtet: ein YouTube-Ausfall öffnet ihn auf
+    allen Knoten, die Cache- und Store-Treffer aber weiter bedienen können.
+    """
+    checks = {
+        "warmup": warmup_state.ready,
+        "event_loop": loop_monitor.lag <= settings.READY_MAX_LOOP_LAG,
+        "fetch_queue": fetch_pool.queued <= settings.READY_MAX_QUEUE
+    }
+    return {
+        "status": "ready" if all(checks.values()) else "not_ready",
+        "checks": checks,
+        "warmup": warmup_state.as_dict(),
+        "event_loop": loop_monitor.as_dict(),
+        "workers": {"fetch": fetch_pool.stats()},
+        "circuit_breaker": upstream_breaker.as_dict(),
+        "cache": {"entries": len(transcript_cache), "bytes": transcript_cache.nbytes()}
+    }
+
+
+def render_metrics():
+    """Metriken im Prometheus-Textformat"""
+    lines = [
+        "# HELP event_loop_lag_seconds Zuletzt gemessener Event-Loop-Lag",
+        "# TYPE event_loop_lag_seconds gauge",
+        f"event_loop_lag_seconds {loop_monitor.lag}",
+        "# HELP event_loop_lag_max_seconds Höchster Event-Loop-Lag seit dem Start",
+        "# TYPE event_loop_lag_max_seconds gauge",
+        f"event_loop_lag_max_seconds {loop_monitor.max_lag}",
+        "# HELP event_loop_lag_histogram_seconds Verteilung der Event-Loop-Lag-Messungen",
+        "# TYPE event_loop_lag_histogram_seconds histogram"
+    ]
+    cumulative = 0
+    for bound, count in zip(loop_monitor.LAG_BUCKETS, loop_monitor.lag_bucket_counts):
+        cumulative += count
+        lines.append(f'event_loop_lag_histogram_seconds_bucket{{le="{bound}"}} {cumulative}')
+    lines += [
+        f'event_loop_lag_histogram_seconds_bucket{{le="+Inf"}} {loop_monitor.lag_count}',
+        f"event_loop_lag_histogram_seconds_sum {loop_monitor.lag_sum}",
+        f"event_loop_lag_histogram_seconds_count {loop_monitor.lag_count}",
+        "# HELP event_loop_blocked_total Erkannte Blockaden über dem Schwellwert (nur im Debug-Modus)",
+        "# TYPE event_loop_blocked_total counter",
+        f"event_loop_blocked_total {loop_monitor.blocked_count}",
+        "# HELP worker_pool_active Laufende Aufgaben pro Worker-Pool",
+        "# TYPE worker_pool_active gauge"
+    ]
+    pools = (fetch_pool, store_pool)
+    lines += [f'worker_pool_active{{pool="{pool.name}"}} {pool.active}' for pool in pools]
+    lines += [
+        "# HELP worker_pool_queued Wartende Aufgaben pro Worker-Pool",
+        "# TYPE worker_pool_queued gauge"
+    ]
+    lines += [f'worker_pool_queued{{pool="{pool.name}"}} {pool.queued}' for pool in pools]
+    lines += [
+        "# HELP upstream_circuit_open 1, wenn der Circuit Breaker für YouTube offen ist",
+        "# TYPE upstream_circuit_open gauge",
+        f"upstream_circuit_open {int(upstream_breaker.state == CircuitBreaker.OPEN)}",
+        "# HELP transcript_cache_entries Einträge im Transcript-Cache",
+        "# TYPE transcript_cache_entries gauge",
+        f"transcript_cache_entries {len(transcript_cache)}",
+        "# HELP transcript_cache_bytes Speicherbedarf der Transcripts im Cache",
+        "# TYPE transcript_cache_bytes gauge",
+        f"transcript_cache_bytes {transcript_cache.nbytes()}"
+    ]
+    return "\n".join(lines) + "\n"
@@ -1,13 +1,40 @@
-from fastapi import FastAPI, Depends, HTTPException, status
+import asyncio
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Depends, HTTPException, Query, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from .endpoints.YTtranscript import LoadTranscript
-from .auth import get_api_key
-from .models import YouTubeRequest, TranscriptResponse, ErrorResponse
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from .endpoints.YTtranscript import LoadTranscript, get_available_languages
+from .access_log import AccessLogMiddleware, note, setup_access_logging, shutdown_access_logging
+from .auth import get_api_key, get_admin_api_key
+from .errors import TranscriptError, UpstreamThrottledError
+from .export import iter_jsonl_export
+from .models import YouTubeRequest, TranscriptResponse, LanguagesResponse, SearchResponse, ErrorResponse
+from .config import settings
+from .store import access_counter, transcript_store
+from .subtitles import SUBTITLE_MEDIA_TYPES
+from .health import loop_monitor, readiness_report, render_metrics
+from .warmup import run_warmup
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    setup_access_logging()
+    loop_monitor.start()
+    # Cache-Warm-up im Hintergrund, damit der Server sofort erreichbar ist
+    warmup_task = asyncio.create_task(run_warmup())
+    flush_task = asyncio.create_task(access_counter.run(settings.ACCESS_FLUSH_INTERVAL))
+    yield
+    warmup_task.cancel()
+    flush_task.cancel()
+    await asyncio.to_thread(access_counter.flush)
+    loop_monitor.stop()
+    shutdown_access_logging()
 
 app = FastAPI(
     title="YouTube Transcript API",
     description="API zum Abrufen von YouTube-Video-Transkripten",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS-Middleware hinzufügen
@@ -19,10 +46,40 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Strukturiertes, gesampeltes JSON-Access-Log über eine Queue
+app.add_middleware(AccessLogMiddleware)
+
+@app.exception_handler(TranscriptError)
+async def transcript_error_handler(request: Request, exc: TranscriptError):
+    note(error=type(exc).__name__, error_detail=exc.detail)
+    headers = {}
+    if isinstance(exc, UpstreamThrottledError):
+        headers["Retry-After"] = str(exc.retry_after)
+    return JSONResponse(status_code=exc.status_code, content={"detail": exc.detail}, headers=headers)
+
 @app.get("/")
 def read_root():
     return {"message": "FastAPI läuft!"}
 
+@app.get("/healthz")
+def liveness():
+    """Liveness: antwortet, solange der Prozess Requests annimmt"""
+    return {"status": "ok"}
+
+@app.get("/readyz")
+async def readiness():
+    """Readiness: Warm-up, Event-Loop-Lag und Warteschlange"""
+    report = readiness_report()
+    return JSONResponse(
+        status_code=status.HTTP_200_OK if report["status"] == "ready" else status.HTTP_503_SERVICE_UNAVAILABLE,
+        content=report
+    )
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """Event-Loop-Lag, Worker-Auslastung und Circuit Breaker im Prometheus-Format"""
+    return render_metrics()
+
 @app.get("/favicon.ico")
 def favicon():
     return {"message": "No favicon"}
@@ -31,9 +88,17 @@ def favicon():
     "/YTtranscript",
     response_model=TranscriptResponse,
     responses={
+        200: {
+            "content": {media_type: {} for media_type in SUBTITLE_MEDIA_TYPES.values()},
+            "description": "Transcript als JSON oder, bei format=srt/vtt, als gestreamte Untertiteldatei"
+        },
         401: {"model": ErrorResponse, "description": "Ungültiger API-Key"},
-        400: {"model": ErrorResponse, "description": "Ungültige YouTube-URL oder Transcript nicht verfügbar"},
-        500: {"model": ErrorResponse, "description": "Interner Serverfehler"}
+        400: {"model": ErrorResponse, "description": "Ungültige YouTube-URL"},
+        404: {"model": ErrorResponse, "description": "Transcripts deaktiviert, nicht vorhanden oder Video nicht verfügbar"},
+        500: {"model": ErrorResponse, "description": "Interner Serverfehler"},
+        502: {"model": ErrorResponse, "description": "Fehlerhafte Antwort von YouTube"},
+        503: {"model": ErrorResponse, "description": "YouTube drosselt Anfragen oder ist vorübergehend nicht erreichbar"},
+        504: {"model": ErrorResponse, "description": "Zeitüberschreitung beim Abruf von YouTube"}
     },
     summary="YouTube-Transcript abrufen",
     description="Ruft das Transcript eines YouTube-Videos ab. Benötigt einen gültigen API-Key."
@@ -43,22 +108,108 @@ async def get_youtube_transcript(
     api_key: str = Depends(get_api_key)
 ):
     try:
-        transcript_loader = LoadTranscript(str(request.url), request.languages)
-        result = transcript_loader.run()
-        
-        return TranscriptResponse(
-            transcript=result["transcript"],
-            video_url=str(request.url),
-            language=result["language"],
-            video_id=result["video_id"]
+        transcript_loader = LoadTranscript(
+            str(request.url),
+            request.languages,
+            request.multi_language,
+            postprocess=request.postprocess,
+            chunk_tokens=request.chunk_tokens,
+            chunk_overlap=request.chunk_overlap
         )
-    except IndexError:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Ungültige YouTube-URL. Stellen Sie sicher, dass die URL einen 'v=' Parameter enthält."
+
+        if request.format != "json":
+            video_id, cues = await transcript_loader.subtitles(
+                request.format,
+                start=request.start,
+                end=request.end,
+                offset=request.offset,
+                limit=request.limit
+            )
+            access_counter.hit(video_id)
+            return StreamingResponse(
+                cues,
+                media_type=SUBTITLE_MEDIA_TYPES[request.format],
+                headers={"Content-Disposition": f'attachment; filename="{video_id}.{request.format}"'}
+            )
+
+        result = await transcript_loader.run(
+            start=request.start,
+            end=request.end,
+            offset=request.offset,
+            limit=request.limit,
+            char_offset=request.char_offset,
+            char_limit=request.char_limit,
+            include_segments=request.include_segments
         )
+        
+        access_counter.hit(result["video_id"])
+        
+        return TranscriptResponse(video_url=str(request.url), **result)
+    except TranscriptError:
+        raise
     except Exception as e:
+        note(error=type(e).__name__, error_detail=str(e))
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Fehler beim Abrufen des Transcripts: {str(e)}"
         )
+
+@app.get(
+    "/YTtranscript/{video_id}/languages",
+    response_model=LanguagesResponse,
+    responses={
+        401: {"model": ErrorResponse, "description": "Ungültiger API-Key"},
+        404: {"model": ErrorResponse, "description": "Transcripts deaktiviert oder Video nicht verfügbar"},
+        502: {"model": ErrorResponse, "description": "Fehlerhafte Antwort von YouTube"},
+        503: {"model": ErrorResponse, "description": "YouTube drosselt Anfragen oder ist vorübergehend nicht erreichbar"},
+        504: {"model": ErrorResponse, "description": "Zeitüberschreitung beim Abruf von YouTube"}
+    },
+    summary="Verfügbare Transcript-Sprachen abrufen",
+    description="Listet die verfügbaren Transcript-Sprachen eines Videos (manuell/automatisch generiert, übersetzbar) aus einem gecachten list_transcripts-Aufruf."
+)
+async def get_transcript_languages(
+    video_id: str,
+    api_key: str = Depends(get_api_key)
+):
+    return LanguagesResponse(**await get_available_languages(video_id))
+
+@app.get(
+    "/search",
+    response_model=SearchResponse,
+    responses={
+        401: {"model": ErrorResponse, "description": "Ungültiger API-Key"}
+    },
+    summary="Volltextsuche über abgerufene Transcripts",
+    description="Durchsucht alle bisher abgerufenen Transcripts über den lokalen Index und liefert Videos mit Treffer-Segmenten und Zeitstempeln."
+)
+def search_transcripts(
+    q: str = Query(..., min_length=1, description="Suchbegriffe"),
+    phrase: bool = Query(False, description="Exakte Wortfolge statt aller Begriffe"),
+    limit: int = Query(20, ge=1, le=100, description="Maximale Anzahl Videos"),
+    api_key: str = Depends(get_api_key)
+):
+    hits = transcript_store.search(q, limit=limit, phrase=phrase)
+    return SearchResponse(query=q, hits=hits)
+
+@app.get(
+    "/admin/export",
+    responses={
+        200: {
+            "content": {"application/gzip": {}, "application/x-ndjson": {}},
+            "description": "Alle gespeicherten Transcripts als JSONL (optional gzip-komprimiert)"
+        },
+        401: {"model": ErrorResponse, "description": "Ungültiger Admin-API-Key"}
+    },
+    summary="Gespeicherte Transcripts exportieren",
+    description="Streamt den kompletten Transcript-Store als JSONL (video_id, language, fetched_at, segments). Benötigt den Admin-API-Key."
+)
+def export_transcripts(
+    compress: bool = Query(True, description="gzip-Komprimierung"),
+    api_key: str = Depends(get_admin_api_key)
+):
+    filename = "transcripts.jsonl.gz" if compress else "transcripts.jsonl"
+    return StreamingResponse(
+        iter_jsonl_export(transcript_store, compress=compress),
+        media_type="application/gzip" if compress else "application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
@@ -1,9 +1,28 @@
-from pydantic import BaseModel, HttpUrl
-from typing import Optional
+from pydantic import BaseModel, Field, HttpUrl
+from typing import Literal, Optional
 
 class YouTubeRequest(BaseModel):
     url: HttpUrl
     languages: Optional[list[str]] = None
+    # Zeitfenster in Sekunden
+    start: Optional[float] = Field(None, ge=0)
+    end: Optional[float] = Field(None, ge=0)
+    # Pagination über Segmente innerhalb des Zeitfensters
+    offset: Optional[int] = Field(None, ge=0)
+    limit: Optional[int] = Field(None, ge=1)
+    # Pagination über Zeichen des resultierenden Texts
+    char_offset: Optional[int] = Field(None, ge=0)
+    char_limit: Optional[int] = Field(None, ge=1)
+    include_segments: bool = False
+    # Alle Sprachen aus languages liefern (fehlende als YouTube-Übersetzung)
+    multi_language: bool = False
+    # Ausgabeformat: JSON oder gestreamte Untertitel (SRT/WebVTT)
+    format: Literal["json", "srt", "vtt"] = "json"
+    # Serverseitige Nachbearbeitung in der angegebenen Reihenfolge
+    postprocess: Optional[list[Literal["strip_tags", "dedupe", "merge_lines"]]] = None
+    # Fenstergröße in geschätzten Tokens für fertige Chunks (z. B. für RAG)
+    chunk_tokens: Optional[int] = Field(None, ge=1)
+    chunk_overlap: int = Field(0, ge=0)
     
     class Config:
         schema_extra = {
@@ -13,11 +32,67 @@ class YouTubeRequest(BaseModel):
             }
         }
 
+class TranscriptSegment(BaseModel):
+    start: float
+    duration: float
+    text: str
+
+class TranscriptChunk(BaseModel):
+    text: str
+    start: float
+    end: float
+    tokens: int
+
+class LanguageTranscript(BaseModel):
+    language: str
+    transcript: str
+    total_segments: Optional[int] = None
+    next_offset: Optional[int] = None
+    next_char_offset: Optional[int] = None
+    segments: Optional[list[TranscriptSegment]] = None
+    chunks: Optional[list[TranscriptChunk]] = None
+
 class TranscriptResponse(BaseModel):
     transcript: str
     video_url: str
     language: str
     video_id: str
+    total_segments: Optional[int] = None
+    next_offset: Optional[int] = None
+    next_char_offset: Optional[int] = None
+    segments: Optional[list[TranscriptSegment]] = None
+    chunks: Optional[list[TranscriptChunk]] = None
+    transcripts: Optional[list[LanguageTranscript]] = None
     
+class LanguageInfo(BaseModel):
+    language_code: str
+    language: str
+    is_generated: bool
+    is_translatable: bool
+
+class TranslationLanguage(BaseModel):
+    language_code: str
+    language: str
+
+class LanguagesResponse(BaseModel):
+    video_id: str
+    languages: list[LanguageInfo]
+    translation_languages: list[TranslationLanguage]
+
+class SearchMatch(BaseModel):
+    segment: int
+    start: float
+    text: str
+
+class SearchHit(BaseModel):
+    video_id: str
+    language: str
+    score: int
+    matches: list[SearchMatch]
+
+class SearchResponse(BaseModel):
+    query: str
+    hits: list[SearchHit]
+
 class ErrorResponse(BaseModel):
     detail: str 
\ No newline at end of file
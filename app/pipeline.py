@@ -0,0 +1,154 @@
+import re
+
+from .cache import CompactTranscript
+
+# Trennzeichen, um alle Segmente in einem Durchlauf per Regex zu bearbeiten
+SEPARATOR = "\x1e"
+TAG_PATTERN = re.compile(r"\[[^\]\x1e]*\]|♪+|>>")
+WHITESPACE_PATTERN = re.compile(r"[^\S\x1e]+")
+SENTENCE_END = (".", "!", "?", "…")
+
+# Obergrenze für zusammengeführte Zeilen ohne Satzende
+MAX_MERGED_CHARS = 300
+# Mindestlänge einer Wiederholung, damit zufällig gleiche Einzelwörter erhalten bleiben
+MIN_OVERLAP_WORDS = 2
+# Grobe Schätzung für Tokenizer gängiger Sprachmodelle
+CHARS_PER_TOKEN = 4
+
+STAGES = {}
+
+
+def stage(name):
+    def register(func):
+        STAGES[name] = func
+        return func
+    return register
+
+
+@stage("strip_tags")
+def strip_tags(texts, starts, durations):
+    """Entfernt [Music]-artige Tags, ♪ und >> und normalisiert Leerraum"""
+    if not texts:
+        return texts, starts, durations
+    # Das Steuerzeichen kann (selten) im Untertitel vorkommen; wie Leerraum behandeln,
+    # damit das Aufteilen genau ein Stück pro Segment liefert
+    joined = SEPARATOR.join(text.replace(SEPARATOR, " ") for text in texts)
+    joined = TAG_PATTERN.sub(" ", joined)
+    joined = WHITESPACE_PATTERN.sub(" ", joined)
+    # Erst nach dem Aufteilen trimmen: str.strip() entfernt auch das Trennzeichen
+    cleaned = [text.strip(" ") for text in joined.split(SEPARATOR)]
+    return _drop_empty(cleaned, starts, durations)
+
+
+@stage("dedupe")
+def dedupe(texts, starts, durations):
+    """Entfernt Wiederholungen automatischer Untertitel.
+
+    Gleiche Folgesegmente werden verschmolzen; wiederholt ein Segment das Ende
+    des vorherigen (rollende Untertitel), wird der wiederholte Anfang entfernt.
+    """
+    out_texts, out_starts, out_durations = [], [], []
+    previous_words = []
+    for text, start, duration in zip(texts, starts, durations):
+        words = text.split()
+        if out_texts and words == previous_words:
+            out_durations[-1] = start + duration - out_starts[-1]
+            continue
+        overlap = _overlap(previous_words, words)
+        if overlap:
+            words = words[overlap:]
+            if not words:
+                out_durations[-1] = start + duration - out_starts[-1]
+                continue
+            text = " ".join(words)
+        out_texts.append(text)
+        out_starts.append(start)
+        out_durations.append(duration)
+        previous_words = text.split()
+    return out_texts, out_starts, out_durations
+
+
+@stage("merge_lines")
+def merge_lines(texts, starts, durations):
+    """Führt umgebrochene Zeilen bis zum Satzende zusammen"""
+    out_texts, out_starts, out_durations = [], [], []
+    pending = []
+    for text, start, duration in zip(texts, starts, durations):
+        if not pending:
+            out_starts.append(start)
+        pending.append(text.replace("\n", " "))
+        end = start + duration
+        merged_length = sum(len(part) for part in pending)
+        if text.rstrip().endswith(SENTENCE_END) or merged_length >= MAX_MERGED_CHARS:
+            out_texts.append(" ".join(pending))
+            out_durations.append(end - out_starts[-1])
+            pending = []
+    if pending:
+        out_texts.append(" ".join(pending))
+        out_durations.append(end - out_starts[-1])
+    return out_texts, out_starts, out_durations
+
+
+def _drop_empty(texts, starts, durations):
+    keep = [index for index, text in enumerate(texts) if text]
+    return [texts[i] for i in keep], [starts[i] for i in keep], [durations[i] for i in keep]
+
+
+def _overlap(previous_words, words):
+    """Länge des längsten Endes von previous_words, mit dem words beginnt"""
+    for size in range(min(len(previous_words), len(words)), MIN_OVERLAP_WORDS - 1, -1):
+        if previous_words[-size:] == words[:size]:
+            return size
+    return 0
+
+
+def estimate_tokens(text):
+    return max(1, -(-len(text) // CHARS_PER_TOKEN))
+
+
+def chunk(compact, chunk_tokens, chunk_overlap=0):
+    """Teilt die Segmente in Fenster von höchstens chunk_tokens geschätzten Tokens.
+
+    Segmente werden nicht geteilt; ein einzelnes zu langes Segment bildet
+    einen eigenen Chunk. chunk_overlap Tokens am Ende eines Chunks werden am
+    Anfang des nächsten wiederholt.
+    """
+    tokens = [estimate_tokens(compact.segment_text(index)) for index in range(len(compact))]
+    chunks = []
+    first = 0
+    while first < len(tokens):
+        last = first
+        total = 0
+        while last < len(tokens) and (last == first or total + tokens[last] <= chunk_tokens):
+            total += tokens[last]
+            last += 1
+        chunks.append({
+            "text": compact.text_range(first, last).replace("\n", " "),
+            "start": compact.starts[first],
+            "end": compact.starts[last - 1] + compact.durations[last - 1],
+            "tokens": total
+        })
+        if last >= len(tokens):
+            break
+        # Überlappung: so viele Segmente vom Ende zurück, wie in chunk_overlap passen
+        next_first = last
+        overlap = 0
+        while next_first - 1 > first and overlap + tokens[next_first - 1] <= chunk_overlap:
+            next_first -= 1
+            overlap += tokens[next_first]
+        first = next_first
+    return chunks
+
+
+def run_pipeline(compact, stages):
+    """Wendet die Stufen in der angegebenen Reihenfolge an und liefert ein neues CompactTranscript"""
+    texts = [compact.segment_text(index) for index in range(len(compact))]
+    starts = list(compact.starts)
+    durations = list(compact.durations)
+    for name in stages:
+        texts, starts, durations = STAGES[name](texts, starts, durations)
+    segments = (
+        {"text": text, "start": start, "duration": duration}
+        for text, start, duration in zip(texts, starts, durations)
+    )
+    return CompactTranscript.from_segments(compact.video_id, compact.language, segments)
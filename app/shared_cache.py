@@ -0,0 +1,108 @@
+import asyncio
+import time
+
+from .config import settings
+
+# Löscht die Sperre nur, wenn sie noch den eigenen Token enthält (atomar auf dem Server)
+RELEASE_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+class InMemoryRedis:
+    """Lokaler Ersatz für den geteilten Cache mit der Teilmenge der redis.asyncio-API,
+    die SharedCacheSource nutzt (get, mget, set mit nx/px, delete, eval für RELEASE_SCRIPT).
+
+    Für Tests und Einzelknoten-Betrieb; Daten werden nicht zwischen Prozessen geteilt.
+    """
+
+    def __init__(self):
+        self._data = {}
+
+    def _get(self, name):
+        entry = self._data.get(name)
+        if entry is None:
+            return None
+        value, expires = entry
+        if expires is not None and expires < time.monotonic():
+            del self._data[name]
+            return None
+        return value
+
+    async def get(self, name):
+        return self._get(name)
+
+    async def mget(self, keys, *args):
+        return [self._get(name) for name in ([keys, *args] if isinstance(keys, str) else keys)]
+
+    async def set(self, name, value, ex=None, px=None, nx=False):
+        if nx and self._get(name) is not None:
+            return None
+        if isinstance(value, str):
+            value = value.encode("utf-8")
+        ttl = px / 1000 if px is not None else ex
+        self._data[name] = (value, time.monotonic() + ttl if ttl is not None else None)
+        return True
+
+    async def delete(self, *names):
+        return sum(self._data.pop(name, None) is not None for name in names)
+
+    async def eval(self, script, numkeys, *keys_and_args):
+        # Lua wird nicht interpretiert; nur die hier verwendeten Skripte sind nachgebildet
+        if script != RELEASE_SCRIPT:
+            raise NotImplementedError("InMemoryRedis unterstützt nur RELEASE_SCRIPT")
+        (name,), (token,) = keys_and_args[:numkeys], keys_and_args[numkeys:]
+        if self._get(name) == token:
+            return await self.delete(name)
+        return 0
+
+
+def create_shared_client(url):
+    """Client für SHARED_CACHE_URL: memory:// für den lokalen Ersatz, sonst Redis"""
+    if url.startswith("memory://"):
+        return InMemoryRedis()
+    try:
+        import redis.asyncio
+    except ImportError:
+        raise RuntimeError("Für SHARED_CACHE_URL wird das Paket 'redis' benötigt (pip install redis)")
+    return redis.asyncio.from_url(url)
+
+
+class SingleFlightLock:
+    """Knotenübergreifende Sperre über SET NX PX, damit nur ein Knoten pro Schlüssel YouTube abfragt"""
+
+    def __init__(self, client, name, timeout):
+        self.client = client
+        self.name = name
+        self.timeout = timeout
+        self.token = f"{id(self)}:{time.monotonic_ns()}".encode()
+
+    async def acquire(self):
+        return bool(await self.client.set(self.name, self.token, px=int(self.timeout * 1000), nx=True))
+
+    async def release(self):
+        # Nur die eigene Sperre löschen; nach Ablauf kann sie einem anderen Knoten gehören
+        await self.client.eval(RELEASE_SCRIPT, 1, self.name, self.token)
+
+
+async def wait_for_result(client, key, error_key, lock_name, timeout, interval=0.05):
+    """Wartet auf den Wert oder die Fehlermarke des Knotens, der die Sperre hält.
+
+    Liefert (value, error); beide sind None, wenn die Sperre ohne Ergebnis
+    freigegeben wurde oder timeout abläuft.
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        value, error, holder = await client.mget([key, error_key, lock_name])
+        if value is not None or error is not None:
+            return value, error
+        if holder is None:
+            return None, None
+        await asyncio.sleep(interval)
+    return None, None
+
+
+shared_client = create_shared_client(settings.SHARED_CACHE_URL) if settings.SHARED_CACHE_URL else None
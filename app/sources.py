@@ -0,0 +1,398 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from abc import ABC, abstractmethod
+
+import requests
+from youtube_transcript_api import YouTubeTranscriptApi
+from youtube_transcript_api._errors import (
+    TranscriptsDisabled, NoTranscriptFound, NoTranscriptAvailable, VideoUnavailable,
+    InvalidVideoId, NotTranslatable, TranslationLanguageNotAvailable, TooManyRequests
+)
+
+from .access_log import count_upstream_call, note, note_cache_hit
+from .cache import CompactTranscript, listing_cache, negative_cache, transcript_cache
+from .circuit import upstream_breaker
+from .config import settings
+from .errors import (
+    TranscriptError, TranscriptsDisabledError, TranscriptNotFoundError, VideoUnavailableError,
+    UpstreamThrottledError, UpstreamTimeoutError, UpstreamError
+)
+from .shared_cache import SingleFlightLock, shared_client, wait_for_result
+from .store import transcript_store
+from .workers import fetch_pool, store_pool
+
+logger = logging.getLogger(__name__)
+
+# TranscriptError-Klassen nach Name, um Fehlermarken aus dem geteilten Cache zu lesen
+ERROR_CLASSES = {error_class.__name__: error_class for error_class in TranscriptError.__subclasses__()}
+
+# Fehler, die YouTube korrekt beantwortet hat, und ihre TranscriptError-Klassen;
+# sie zählen nicht für den Circuit Breaker
+UPSTREAM_ERROR_TYPES = (
+    (TranscriptsDisabled, TranscriptsDisabledError),
+    ((NoTranscriptFound, NoTranscriptAvailable, NotTranslatable, TranslationLanguageNotAvailable), TranscriptNotFoundError),
+    ((VideoUnavailable, InvalidVideoId), VideoUnavailableError)
+)
+
+
+class TranscriptTrack:
+    """Eine verfügbare Transcript-Spur eines Videos.
+
+    handle ist ein quellenspezifisches Objekt (bei YouTube das Transcript der
+    Bibliothek), das nur von der Quelle selbst ausgewertet wird.
+    """
+
+    def __init__(self, language_code, language, is_generated=False, is_translatable=False,
+                 translation_languages=None, translated_from=None, handle=None):
+        self.language_code = language_code
+        self.language = language
+        self.is_generated = is_generated
+        self.is_translatable = is_translatable
+        self.translation_languages = translation_languages or []
+        # Bei Übersetzungen die Ausgangssprache, sonst None
+        self.translated_from = translated_from
+        self.handle = handle
+
+    def as_dict(self):
+        """Metadaten ohne handle, z. B. für den geteilten Cache"""
+        return {
+            "language_code": self.language_code,
+            "language": self.language,
+            "is_generated": self.is_generated,
+            "is_translatable": self.is_translatable,
+            "translation_languages": self.translation_languages,
+            "translated_from": self.translated_from
+        }
+
+    @property
+    def label(self):
+        return f"{self.language_code} ({self.language})"
+
+    def translate(self, language_code):
+        """Spur für eine Übersetzung dieser Spur in language_code"""
+        names = {t["language_code"]: t["language"] for t in self.translation_languages}
+        return TranscriptTrack(
+            language_code,
+            names.get(language_code, language_code),
+            is_generated=True,
+            translated_from=self.language_code,
+            handle=self.handle
+        )
+
+
+class TranscriptSource(ABC):
+    """Asynchrone Quelle für Transcripts"""
+
+    @abstractmethod
+    async def list_tracks(self, video_id):
+        """Liste der verfügbaren TranscriptTrack eines Videos (manuelle zuerst)"""
+
+    @abstractmethod
+    async def fetch(self, video_id, track):
+        """Lädt eine Spur als CompactTranscript"""
+
+    async def fetch_many(self, video_id, tracks):
+        """Lädt mehrere Spuren parallel; Quellen mit Batch-Zugriff überschreiben das"""
+        return list(await asyncio.gather(*(self.fetch(video_id, track) for track in tracks)))
+
+
+class YouTubeSource(TranscriptSource):
+    """Abruf über youtube_transcript_api; blockierende Aufrufe laufen im fetch_pool"""
+
+    async def list_tracks(self, video_id):
+        transcript_list = await fetch_pool.run(call_upstream, YouTubeTranscriptApi.list_transcripts, video_id)
+        tracks = [
+            TranscriptTrack(
+                transcript.language_code,
+                transcript.language,
+                is_generated=transcript.is_generated,
+                is_translatable=transcript.is_translatable,
+                translation_languages=transcript.translation_languages,
+                handle=transcript
+            )
+            for transcript in transcript_list
+        ]
+        # find_transcript der Bibliothek bevorzugt manuelle Transcripts
+        return sorted(tracks, key=lambda track: track.is_generated)
+
+    async def fetch(self, video_id, track):
+        transcript = track.handle
+        if transcript is None:
+            # Spur stammt aus dem geteilten Cache: Bibliotheksobjekt neu ermitteln
+            transcript = await self._find_transcript(video_id, track)
+        if track.translated_from:
+            transcript = transcript.translate(track.language_code)
+        segments = await fetch_pool.run(call_upstream, transcript.fetch)
+        return CompactTranscript.from_segments(video_id, track.label, segments)
+
+    async def _find_transcript(self, video_id, track):
+        source_code = track.translated_from or track.language_code
+        candidates = [
+            candidate for candidate in await self.list_tracks(video_id)
+            if candidate.language_code == source_code
+        ]
+        if not candidates:
+            raise TranscriptNotFoundError()
+        # Übersetzungen haben is_generated=True; dann gilt die Sortierung (manuell zuerst)
+        for candidate in candidates:
+            if track.translated_from or candidate.is_generated == track.is_generated:
+                return candidate.handle
+        return candidates[0].handle
+
+
+class FixtureSource(TranscriptSource):
+    """Lokale Transcripts aus JSON-Dateien (<directory>/<video_id>.json) für Tests und Benchmarks.
+
+    Format: {"transcripts": [{"language_code": "de", "language": "Deutsch",
+    "is_generated": false, "segments": [{"text": ..., "start": ..., "duration": ...}]}]}
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def _read(self, video_id):
+        path = os.path.join(self.directory, f"{os.path.basename(video_id)}.json")
+        try:
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            raise VideoUnavailableError()
+
+    async def list_tracks(self, video_id):
+        data = await asyncio.to_thread(self._read, video_id)
+        tracks = [
+            TranscriptTrack(
+                entry["language_code"],
+                entry.get("language", entry["language_code"]),
+                is_generated=entry.get("is_generated", False)
+            )
+            for entry in data.get("transcripts", [])
+        ]
+        if not tracks:
+            raise TranscriptsDisabledError()
+        return sorted(tracks, key=lambda track: track.is_generated)
+
+    async def fetch(self, video_id, track):
+        if track.translated_from:
+            raise TranscriptNotFoundError("Übersetzungen sind mit Fixture-Transcripts nicht verfügbar")
+        data = await asyncio.to_thread(self._read, video_id)
+        for entry in data.get("transcripts", []):
+            if entry["language_code"] == track.language_code and entry.get("is_generated", False) == track.is_generated:
+                return CompactTranscript.from_segments(video_id, track.label, entry["segments"])
+        raise TranscriptNotFoundError()
+
+
+class StoreSource(TranscriptSource):
+    """Liest Transcripts zuerst aus dem persistenten Store und legt neu geladene dort ab"""
+
+    def __init__(self, inner, store, pool=None):
+        self.inner = inner
+        self.store = store
+        self.pool = pool or store_pool
+        # Laufende Schreibvorgänge, damit sie nicht unbeobachtet verloren gehen
+        self._pending_writes = set()
+
+    async def list_tracks(self, video_id):
+        return await self.inner.list_tracks(video_id)
+
+    async def fetch(self, video_id, track):
+        if not track.translated_from:
+            compact = await asyncio.to_thread(self.store.load, video_id, track.label)
+            if compact is not None:
+                note(store_hit=True)
+                return compact
+        compact = await self.inner.fetch(video_id, track)
+        # Speichern und Indexieren, ohne auf das Ergebnis zu warten
+        future = self.pool.submit(self.store.add, compact)
+        self._pending_writes.add(future)
+        future.add_done_callback(lambda done: self._write_done(done, compact))
+        return compact
+
+    def _write_done(self, future, compact):
+        self._pending_writes.discard(future)
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            logger.error(
+                "Transcript %s (%s) konnte nicht gespeichert werden",
+                compact.video_id, compact.language, exc_info=error
+            )
+
+
+class CachedSource(TranscriptSource):
+    """In-Process-Cache für Sprachlisten, Transcripts und permanente Fehler"""
+
+    def __init__(self, inner):
+        self.inner = inner
+
+    async def list_tracks(self, video_id):
+        cached_error = negative_cache.get(video_id)
+        if cached_error is not None:
+            raise type(cached_error)(cached_error.detail)
+        tracks = listing_cache.get(video_id)
+        if tracks is None:
+            try:
+                tracks = await self.inner.list_tracks(video_id)
+            except TranscriptError as e:
+                if e.cacheable:
+                    negative_cache.set(video_id, e)
+                raise
+            listing_cache.set(video_id, tracks)
+        return tracks
+
+    async def fetch(self, video_id, track):
+        return (await self.fetch_many(video_id, [track]))[0]
+
+    async def fetch_many(self, video_id, tracks):
+        cache_keys = [(video_id, track.language_code, track.translated_from) for track in tracks]
+        compacts = [transcript_cache.get(cache_key) for cache_key in cache_keys]
+        missing = [index for index, compact in enumerate(compacts) if compact is None]
+        note_cache_hit(not missing)
+        if missing:
+            fetched = await self.inner.fetch_many(video_id, [tracks[index] for index in missing])
+            for index, compact in zip(missing, fetched):
+                transcript_cache.set(cache_keys[index], compact)
+                compacts[index] = compact
+        return compacts
+
+
+class SharedCacheSource(TranscriptSource):
+    """Geteilter Cache mehrerer Knoten (Redis-Protokoll) vor Store und Backend.
+
+    Mehrere Spuren werden mit einem MGET gelesen. Bei einem Fehltreffer lädt
+    nur der Knoten, der die Single-Flight-Sperre erhält; die anderen warten
+    auf dessen Ergebnis im geteilten Cache. Innerhalb eines Prozesses werden
+    gleichzeitige Abrufe desselben Schlüssels zusammengefasst.
+    """
+
+    def __init__(self, inner, client, ttl, lock_timeout, error_ttl=5.0, listing_ttl=None):
+        self.inner = inner
+        self.client = client
+        self.ttl = ttl
+        # Sprachlisten verfallen wie im In-Process-Listing-Cache, nicht mit den Transcripts
+        self.listing_ttl = settings.LISTING_CACHE_TTL if listing_ttl is None else listing_ttl
+        self.lock_timeout = lock_timeout
+        self.error_ttl = error_ttl
+        self._inflight = {}
+
+    def _transcript_key(self, video_id, track):
+        return f"yt:transcript:{video_id}:{track.language_code}:{track.translated_from or ''}"
+
+    async def list_tracks(self, video_id):
+        key = f"yt:tracks:{video_id}"
+        cached = await self.client.get(key)
+        if cached is not None:
+            return [TranscriptTrack(**entry) for entry in json.loads(cached)]
+        tracks = await self.inner.list_tracks(video_id)
+        await self.client.set(key, json.dumps([track.as_dict() for track in tracks]), px=int(self.listing_ttl * 1000))
+        return tracks
+
+    async def fetch(self, video_id, track):
+        return (await self.fetch_many(video_id, [track]))[0]
+
+    async def fetch_many(self, video_id, tracks):
+        keys = [self._transcript_key(video_id, track) for track in tracks]
+        values = await self.client.mget(keys)
+        compacts = [CompactTranscript.from_bytes(value) if value is not None else None for value in values]
+        missing = [index for index, compact in enumerate(compacts) if compact is None]
+        note(shared_cache_hit=not missing)
+        fetched = await asyncio.gather(*(self._fetch_once(video_id, tracks[index], keys[index]) for index in missing))
+        for index, compact in zip(missing, fetched):
+            compacts[index] = compact
+        return compacts
+
+    async def _fetch_once(self, video_id, track, key):
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_locked(video_id, track, key))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _fetch_locked(self, video_id, track, key):
+        lock = SingleFlightLock(self.client, f"lock:{key}", self.lock_timeout)
+        error_key = f"error:{key}"
+        if not await lock.acquire():
+            value, error = await wait_for_result(self.client, key, error_key, lock.name, self.lock_timeout)
+            if value is not None:
+                return CompactTranscript.from_bytes(value)
+            if error is not None:
+                # Fehler des anderen Knotens übernehmen, ohne YouTube erneut abzufragen
+                error = json.loads(error)
+                raise ERROR_CLASSES.get(error["type"], UpstreamError)(error["detail"])
+            # Der andere Knoten hat ohne Ergebnis aufgegeben: selbst laden
+        try:
+            compact = await self.inner.fetch(video_id, track)
+        except TranscriptError as e:
+            marker = json.dumps({"type": type(e).__name__, "detail": e.detail})
+            await self.client.set(error_key, marker, px=int(self.error_ttl * 1000))
+            raise
+        else:
+            await self.client.set(key, compact.to_bytes(), px=int(self.ttl * 1000))
+            return compact
+        finally:
+            await lock.release()
+
+
+def call_upstream(func, *args):
+    """Ruft YouTube über den Circuit Breaker auf und übersetzt Fehler in TranscriptError"""
+    if not upstream_breaker.allow():
+        raise UpstreamThrottledError()
+    started = time.perf_counter()
+    try:
+        result = func(*args)
+    except Exception as e:
+        error = _translate_upstream_error(e)
+        if isinstance(error, (UpstreamThrottledError, UpstreamTimeoutError, UpstreamError)):
+            upstream_breaker.record_failure()
+        else:
+            upstream_breaker.record_success()
+        raise error from e
+    finally:
+        count_upstream_call(time.perf_counter() - started)
+    upstream_breaker.record_success()
+    return result
+
+
+def _translate_upstream_error(e):
+    for library_errors, error_class in UPSTREAM_ERROR_TYPES:
+        if isinstance(e, library_errors):
+            return error_class()
+    if isinstance(e, TooManyRequests):
+        return UpstreamThrottledError()
+    if isinstance(e, requests.exceptions.Timeout):
+        return UpstreamTimeoutError()
+    if isinstance(e, requests.exceptions.HTTPError) and e.response is not None and e.response.status_code == 429:
+        return UpstreamThrottledError()
+    return UpstreamError(f"Fehlerhafte Antwort von YouTube: {type(e).__name__}")
+
+
+BACKENDS = {
+    "youtube": lambda: YouTubeSource(),
+    "fixtures": lambda: FixtureSource(settings.FIXTURE_DIR)
+}
+
+
+def build_source():
+    """Setzt die Quellen-Kette aus der Konfiguration zusammen (Cache → Shared → Store → Backend)"""
+    if settings.TRANSCRIPT_BACKEND not in BACKENDS:
+        raise ValueError(f"Unbekanntes TRANSCRIPT_BACKEND: {settings.TRANSCRIPT_BACKEND}")
+    source = BACKENDS[settings.TRANSCRIPT_BACKEND]()
+    layers = {layer.strip() for layer in settings.TRANSCRIPT_LAYERS.split(",") if layer.strip()}
+    if "store" in layers:
+        source = StoreSource(source, transcript_store)
+    if "shared" in layers and shared_client is not None:
+        source = SharedCacheSource(
+            source, shared_client, settings.SHARED_CACHE_TTL, settings.SHARED_CACHE_LOCK_TIMEOUT,
+            settings.SHARED_CACHE_ERROR_TTL, settings.SHARED_CACHE_LISTING_TTL
+        )
+    if "cache" in layers:
+        source = CachedSource(source)
+    return source
+
+
+transcript_source = build_source()
@@ -0,0 +1,277 @@
+import asyncio
+import logging
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter
+
+from .cache import CompactTranscript
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    video_id TEXT NOT NULL,
+    language TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    segment_count INTEGER NOT NULL,
+    PRIMARY KEY (video_id, language)
+);
+CREATE TABLE IF NOT EXISTS segments (
+    video_id TEXT NOT NULL,
+    language TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    start REAL NOT NULL,
+    duration REAL NOT NULL,
+    text TEXT NOT NULL,
+    PRIMARY KEY (video_id, language, seq)
+);
+CREATE TABLE IF NOT EXISTS postings (
+    term TEXT NOT NULL,
+    video_id TEXT NOT NULL,
+    language TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    position INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS postings_term ON postings (term);
+CREATE INDEX IF NOT EXISTS postings_document ON postings (video_id, language);
+CREATE TABLE IF NOT EXISTS access_log (
+    video_id TEXT PRIMARY KEY,
+    hits INTEGER NOT NULL,
+    last_access REAL NOT NULL
+);
+"""
+
+
+def tokenize(text):
+    """Zerlegt Text in kleingeschriebene Wort-Tokens"""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class TranscriptStore:
+    """Lokal persistierter Transcript-Speicher mit invertiertem Index (SQLite).
+
+    Jedes abgerufene Transcript wird mit seinen Segmenten abgelegt; für jedes
+    Token wird (Video, Sprache, Segment, Position) im Index vermerkt, sodass
+    Suchanfragen ohne erneuten Abruf beantwortet werden können.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._connection = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        if self._connection is None:
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            self._connection.executescript(SCHEMA)
+        return self._connection
+
+    def add(self, compact):
+        """Legt ein CompactTranscript ab und indexiert es (ersetzt vorhandene Einträge)"""
+        key = (compact.video_id, compact.language)
+        segment_rows = []
+        posting_rows = []
+        for seq, (start, duration, text) in enumerate(compact.iter_segments()):
+            segment_rows.append(key + (seq, start, duration, text))
+            for position, term in enumerate(tokenize(text)):
+                posting_rows.append((term,) + key + (seq, position))
+
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute("DELETE FROM documents WHERE video_id = ? AND language = ?", key)
+                connection.execute("DELETE FROM segments WHERE video_id = ? AND language = ?", key)
+                connection.execute("DELETE FROM postings WHERE video_id = ? AND language = ?", key)
+                connection.execute(
+                    "INSERT INTO documents VALUES (?, ?, ?, ?)",
+                    key + (time.time(), len(segment_rows))
+                )
+                connection.executemany("INSERT INTO segments VALUES (?, ?, ?, ?, ?, ?)", segment_rows)
+                connection.executemany("INSERT INTO postings VALUES (?, ?, ?, ?, ?)", posting_rows)
+
+    def load(self, video_id, language):
+        """Liest ein gespeichertes Transcript als CompactTranscript (oder None)"""
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT text, start, duration FROM segments"
+                " WHERE video_id = ? AND language = ? ORDER BY seq",
+                (video_id, language)
+            ).fetchall()
+        if not rows:
+            return None
+        segments = ({"text": text, "start": start, "duration": duration} for text, start, duration in rows)
+        return CompactTranscript.from_segments(video_id, language, segments)
+
+    def search(self, query, limit=20, max_matches=10, phrase=False):
+        """Sucht Segmente, die alle Begriffe (oder bei phrase=True die exakte Wortfolge) enthalten.
+
+        Liefert pro Video/Sprache die Treffer-Segmente mit Startzeit, sortiert
+        nach Anzahl der Treffer. Bewertung und Limit werden in SQL berechnet;
+        Segmenttexte werden nur für die besten Videos gelesen.
+        """
+        terms = tokenize(query)
+        if not terms:
+            return []
+
+        if phrase:
+            # Aufeinanderfolgende Positionen im selben Segment über Self-Joins
+            joins = "".join(
+                f" JOIN postings p{i} ON p{i}.video_id = p0.video_id AND p{i}.language = p0.language"
+                f" AND p{i}.seq = p0.seq AND p{i}.position = p0.position + {i} AND p{i}.term = ?"
+                for i in range(1, len(terms))
+            )
+            sql = (
+                "SELECT DISTINCT p0.video_id, p0.language, p0.seq FROM postings p0"
+                + joins + " WHERE p0.term = ?"
+            )
+            params = terms[1:] + terms[:1]
+        else:
+            unique_terms = sorted(set(terms))
+            placeholders = ", ".join("?" * len(unique_terms))
+            sql = (
+                "SELECT video_id, language, seq FROM postings"
+                f" WHERE term IN ({placeholders})"
+                " GROUP BY video_id, language, seq"
+                " HAVING COUNT(DISTINCT term) = ?"
+            )
+            params = unique_terms + [len(unique_terms)]
+
+        sql = (
+            f"WITH matches AS ({sql}),"
+            " top AS ("
+            " SELECT video_id, language, COUNT(*) AS score FROM matches"
+            " GROUP BY video_id, language ORDER BY score DESC, video_id, language LIMIT ?),"
+            " ranked AS ("
+            " SELECT m.video_id, m.language, m.seq,"
+            " ROW_NUMBER() OVER (PARTITION BY m.video_id, m.language ORDER BY m.seq) AS rank"
+            " FROM matches m JOIN top t ON t.video_id = m.video_id AND t.language = m.language)"
+            " SELECT t.video_id, t.language, t.score, r.seq, s.start, s.text"
+            " FROM top t JOIN ranked r ON r.video_id = t.video_id AND r.language = t.language"
+            " JOIN segments s ON s.video_id = r.video_id AND s.language = r.language AND s.seq = r.seq"
+            " WHERE r.rank <= ?"
+            " ORDER BY t.score DESC, t.video_id, t.language, r.seq"
+        )
+        params = params + [limit, max_matches]
+
+        with self._lock:
+            rows = self._connect().execute(sql, params).fetchall()
+
+        hits = {}
+        for video_id, language, score, seq, start, text in rows:
+            hit = hits.setdefault((video_id, language), {
+                "video_id": video_id,
+                "language": language,
+                "score": score,
+                "matches": []
+            })
+            hit["matches"].append({"segment": seq, "start": start, "text": text})
+
+        return list(hits.values())
+
+    def record_accesses(self, hits):
+        """Addiert Abrufzahlen ({video_id: Anzahl}) in einer Transaktion zum Zugriffslog"""
+        now = time.time()
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.executemany(
+                    "INSERT INTO access_log VALUES (?, ?, ?)"
+                    " ON CONFLICT (video_id) DO UPDATE SET"
+                    " hits = hits + excluded.hits, last_access = excluded.last_access",
+                    [(video_id, count, now) for video_id, count in hits.items()]
+                )
+
+    def top_videos(self, limit):
+        """Die meistabgerufenen Video-IDs laut Zugriffslog"""
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT video_id FROM access_log ORDER BY hits DESC, last_access DESC LIMIT ?",
+                (limit,)
+            ).fetchall()
+        return [video_id for video_id, in rows]
+
+    def iter_documents(self, batch_size=100):
+        """Liefert alle gespeicherten Transcripts batchweise (Keyset-Pagination).
+
+        Pro Batch wird die Datenbank nur kurz gesperrt; es liegt nie mehr als
+        ein Batch im Speicher.
+        """
+        last_key = ("", "")
+        while True:
+            with self._lock:
+                connection = self._connect()
+                documents = connection.execute(
+                    "SELECT video_id, language, fetched_at FROM documents"
+                    " WHERE (video_id, language) > (?, ?)"
+                    " ORDER BY video_id, language LIMIT ?",
+                    last_key + (batch_size,)
+                ).fetchall()
+                batch = []
+                for video_id, language, fetched_at in documents:
+                    segments = connection.execute(
+                        "SELECT start, duration, text FROM segments"
+                        " WHERE video_id = ? AND language = ? ORDER BY seq",
+                        (video_id, language)
+                    ).fetchall()
+                    batch.append({
+                        "video_id": video_id,
+                        "language": language,
+                        "fetched_at": fetched_at,
+                        "segments": [
+                            {"start": start, "duration": duration, "text": text}
+                            for start, duration, text in segments
+                        ]
+                    })
+            yield from batch
+            if len(documents) < batch_size:
+                return
+            last_key = documents[-1][:2]
+
+
+class AccessCounter:
+    """Zählt Abrufe im Speicher und schreibt sie gesammelt ins Zugriffslog.
+
+    So hält nicht jeder Request die Store-Sperre für eine eigene
+    Schreib-Transaktion.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self._hits = Counter()
+        self._lock = threading.Lock()
+
+    def hit(self, video_id):
+        with self._lock:
+            self._hits[video_id] += 1
+
+    def flush(self):
+        """Schreibt die gesammelten Abrufe und setzt die Zähler zurück"""
+        with self._lock:
+            hits, self._hits = self._hits, Counter()
+        if not hits:
+            return
+        try:
+            self.store.record_accesses(hits)
+        except Exception:
+            # Beim nächsten Flush erneut versuchen
+            with self._lock:
+                self._hits.update(hits)
+            raise
+
+    async def run(self, interval):
+        """Hintergrund-Task: schreibt alle interval Sekunden"""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await asyncio.to_thread(self.flush)
+            except Exception as e:
+                logger.warning("Zugriffslog konnte nicht geschrieben werden: %s", e)
+
+
+transcript_store = TranscriptStore(settings.STORE_PATH)
+access_counter = AccessCounter(transcript_store)
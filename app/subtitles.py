@@ -0,0 +1,68 @@
+SUBTITLE_MEDIA_TYPES = {
+    "srt": "application/x-subrip",
+    "vtt": "text/vtt"
+}
+
+# Anzahl Cues, die zu einem Chunk der gestreamten Antwort zusammengefasst werden
+CUES_PER_CHUNK = 100
+
+
+def _timestamp(seconds, separator):
+    milliseconds = int(round(seconds * 1000))
+    hours, milliseconds = divmod(milliseconds, 3_600_000)
+    minutes, milliseconds = divmod(milliseconds, 60_000)
+    seconds, milliseconds = divmod(milliseconds, 1000)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}{separator}{milliseconds:03d}"
+
+
+def _cue_text(text):
+    # Leerzeilen würden den Cue in SRT und WebVTT vorzeitig beenden
+    return "\n".join(line for line in text.splitlines() if line.strip())
+
+
+def _srt_text(text):
+    # "-->" würde als Zeitstempel-Zeile gelesen
+    return _cue_text(text).replace("-->", "->")
+
+
+def _vtt_text(text):
+    # WebVTT verbietet "-->" im Cue-Text; & und < leiten Entities und Tags ein
+    return _cue_text(text).replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def _chunked(cues):
+    buffer = []
+    for cue in cues:
+        buffer.append(cue)
+        if len(buffer) >= CUES_PER_CHUNK:
+            yield "".join(buffer)
+            buffer = []
+    if buffer:
+        yield "".join(buffer)
+
+
+def iter_srt(compact, first=0, last=None):
+    """Schreibt die Segmente first..last-1 schrittweise als SRT-Cues"""
+    def cues():
+        for number, (start, duration, text) in enumerate(compact.iter_segments(first, last), 1):
+            yield (
+                f"{number}\n"
+                f"{_timestamp(start, ',')} --> {_timestamp(start + duration, ',')}\n"
+                f"{_srt_text(text)}\n\n"
+            )
+    return _chunked(cues())
+
+
+def iter_vtt(compact, first=0, last=None):
+    """Schreibt die Segmente first..last-1 schrittweise als WebVTT-Cues"""
+    def cues():
+        yield "WEBVTT\n\n"
+        for start, duration, text in compact.iter_segments(first, last):
+            yield f"{_timestamp(start, '.')} --> {_timestamp(start + duration, '.')}\n{_vtt_text(text)}\n\n"
+    return _chunked(cues())
+
+
+SUBTITLE_WRITERS = {
+    "srt": iter_srt,
+    "vtt": iter_vtt
+}
@@ -0,0 +1,104 @@
+import asyncio
+import logging
+import time
+
+from .config import settings
+from .endpoints.YTtranscript import LoadTranscript
+from .store import transcript_store
+
+logger = logging.getLogger(__name__)
+
+
+class WarmupState:
+    """Fortschritt des Cache-Warm-ups beim Start"""
+
+    def __init__(self):
+        self.status = "pending"
+        self.total = 0
+        self.loaded = 0
+        self.failed = 0
+        self.started_at = None
+        self.finished_at = None
+
+    @property
+    def ready(self):
+        return self.status == "done"
+
+    def as_dict(self):
+        return {
+            "status": self.status,
+            "total": self.total,
+            "loaded": self.loaded,
+            "failed": self.failed,
+            "duration": (
+                (self.finished_at or time.monotonic()) - self.started_at
+                if self.started_at is not None else None
+            )
+        }
+
+
+warmup_state = WarmupState()
+
+
+def warmup_video_ids():
+    """Konfigurierte Video-IDs plus die meistabgerufenen aus dem Zugriffslog"""
+    video_ids = [video_id.strip() for video_id in settings.WARMUP_VIDEO_IDS.split(",") if video_id.strip()]
+    if settings.WARMUP_TOP_N > 0:
+        video_ids.extend(transcript_store.top_videos(settings.WARMUP_TOP_N))
+    return list(dict.fromkeys(video_ids))
+
+
+async def warm_cache(video_ids, concurrency=None, rate=None):
+    """Lädt die Videos parallel in den Transcript-Cache.
+
+    Höchstens concurrency Abrufe laufen gleichzeitig, und es werden maximal
+    rate Abrufe pro Sekunde gestartet, damit YouTube nicht überlastet wird.
+    """
+    concurrency = concurrency or settings.WARMUP_CONCURRENCY
+    rate = rate or settings.WARMUP_RATE
+    interval = 1.0 / rate if rate > 0 else 0.0
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(concurrency)
+    rate_lock = asyncio.Lock()
+    next_start = loop.time()
+
+    warmup_state.status = "running"
+    warmup_state.total = len(video_ids)
+    warmup_state.started_at = time.monotonic()
+
+    async def throttle():
+        nonlocal next_start
+        async with rate_lock:
+            delay = next_start - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            next_start = max(loop.time(), next_start) + interval
+
+    async def preload(video_id):
+        async with semaphore:
+            await throttle()
+            try:
+                await LoadTranscript(f"https://www.youtube.com/watch?v={video_id}").load(video_id)
+                warmup_state.loaded += 1
+            except Exception as e:
+                warmup_state.failed += 1
+                logger.warning("Warm-up für %s fehlgeschlagen: %s", video_id, e)
+
+    await asyncio.gather(*(preload(video_id) for video_id in video_ids))
+
+    warmup_state.status = "done"
+    warmup_state.finished_at = time.monotonic()
+    logger.info(
+        "Cache-Warm-up abgeschlossen: %d geladen, %d fehlgeschlagen",
+        warmup_state.loaded, warmup_state.failed
+    )
+
+
+async def run_warmup():
+    """Startup-Hook: ermittelt die Video-IDs und wärmt den Cache vor"""
+    try:
+        video_ids = await asyncio.to_thread(warmup_video_ids)
+    except Exception as e:
+        logger.warning("Warm-up-Liste konnte nicht gelesen werden: %s", e)
+        video_ids = []
+    await warm_cache(video_ids)
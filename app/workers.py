@@ -0,0 +1,60 @@
+import asyncio
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .config import settings
+
+
+class WorkerPool:
+    """ThreadPoolExecutor mit Zählern für laufende und wartende Aufgaben"""
+
+    def __init__(self, max_workers, name):
+        self.name = name
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._active = 0
+
+    def submit(self, func, *args, **kwargs):
+        def task():
+            with self._lock:
+                self._active += 1
+            try:
+                return func(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self._active -= 1
+                    self._pending -= 1
+
+        with self._lock:
+            self._pending += 1
+        try:
+            # Kontext (z. B. Access-Log-Felder des Requests) in den Worker übernehmen
+            return self._executor.submit(contextvars.copy_context().run, task)
+        except Exception:
+            with self._lock:
+                self._pending -= 1
+            raise
+
+    async def run(self, func, *args, **kwargs):
+        """Führt eine blockierende Funktion im Pool aus, ohne den Event-Loop zu blockieren"""
+        return await asyncio.wrap_future(self.submit(func, *args, **kwargs))
+
+    @property
+    def active(self):
+        return self._active
+
+    @property
+    def queued(self):
+        return max(0, self._pending - self._active)
+
+    def stats(self):
+        return {"workers": self.max_workers, "active": self.active, "queued": self.queued}
+
+
+# Blockierende Upstream-Abrufe außerhalb des Event-Loops
+fetch_pool = WorkerPool(settings.FETCH_WORKERS, "transcript-fetch")
+# Schreibzugriffe auf den Transcript-Store; SQLite serialisiert sie ohnehin
+store_pool = WorkerPool(1, "transcript-store")
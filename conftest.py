@@ -0,0 +1,48 @@
+import os
+import tempfile
+
+import pytest
+from fastapi.testclient import TestClient
+
+# Integrations-Skripte gegen einen laufenden Server (python test_api.py), keine pytest-Tests
+collect_ignore = ["test_api.py", "test_api_async.py"]
+
+# Die Einstellungen werden beim Import von app.config gelesen; für die Tests
+# laufen alle Abrufe gegen die Fixture-Transcripts und einen temporären Store.
+os.environ.update({
+    "API_KEY": "test-key",
+    "ADMIN_API_KEY": "test-admin-key",
+    "TRANSCRIPT_BACKEND": "fixtures",
+    "FIXTURE_DIR": os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures"),
+    "TRANSCRIPT_LAYERS": "cache,store",
+    "SHARED_CACHE_URL": "",
+    "STORE_PATH": os.path.join(tempfile.mkdtemp(prefix="transcripts-test-"), "transcripts.db"),
+    "ACCESS_LOG_ENABLED": "false",
+    "WARMUP_VIDEO_IDS": "",
+    "WARMUP_TOP_N": "0"
+})
+
+# app.* erst nach dem Setzen der Umgebung importieren
+from app.cache import listing_cache, negative_cache, pipeline_cache, transcript_cache
+from app.main import app
+from app.workers import store_pool
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    for cache in (transcript_cache, listing_cache, negative_cache, pipeline_cache):
+        cache.clear()
+
+
+@pytest.fixture
+def wait_for_store_writes():
+    def wait():
+        # Der Store-Pool hat einen Worker; eine leere Aufgabe läuft erst nach allen vorherigen
+        store_pool.submit(lambda: None).result()
+    return wait
@@ -0,0 +1,92 @@
+import io
+import json
+import sys
+
+import pytest
+
+from app import access_log
+from app.access_log import _should_log, count_upstream_call, setup_access_logging, shutdown_access_logging
+from app.config import settings
+from app.sources import FixtureSource
+
+# Access-Log: Sampling-Regel und die pro Request gesammelten Felder
+
+HEADERS = {"X-API-Key": "test-key"}
+
+
+@pytest.fixture
+def access_records(monkeypatch):
+    """Aktiviert das Access-Log und liefert eine Funktion, die die geschriebenen JSON-Zeilen liest"""
+    output = io.StringIO()
+    # Der StreamHandler übernimmt sys.stdout beim Einrichten
+    monkeypatch.setattr(sys, "stdout", output)
+    monkeypatch.setattr(settings, "ACCESS_LOG_ENABLED", True)
+    monkeypatch.setattr(settings, "ACCESS_LOG_SAMPLE_RATE", 1.0)
+    setup_access_logging()
+
+    def read():
+        # Der Listener schreibt in einem eigenen Thread; stop() leert die Queue
+        shutdown_access_logging()
+        return [json.loads(line) for line in output.getvalue().splitlines()]
+
+    yield read
+    shutdown_access_logging()
+
+
+def test_errors_and_slow_requests_are_always_logged(monkeypatch):
+    monkeypatch.setattr(settings, "ACCESS_LOG_SAMPLE_RATE", 0.0)
+    monkeypatch.setattr(settings, "ACCESS_LOG_SLOW_THRESHOLD", 1.0)
+    assert _should_log({"status": 404, "duration_ms": 1.0})
+    assert _should_log({"status": 200, "error": "UpstreamError", "duration_ms": 1.0})
+    assert _should_log({"duration_ms": 1.0})
+    assert _should_log({"status": 200, "duration_ms": 1000.0})
+    assert not _should_log({"status": 200, "duration_ms": 999.9})
+
+
+def test_other_requests_are_sampled(monkeypatch):
+    monkeypatch.setattr(settings, "ACCESS_LOG_SAMPLE_RATE", 0.25)
+    monkeypatch.setattr(access_log.random, "random", lambda: 0.2)
+    assert _should_log({"status": 200, "duration_ms": 1.0})
+    monkeypatch.setattr(access_log.random, "random", lambda: 0.3)
+    assert not _should_log({"status": 200, "duration_ms": 1.0})
+
+
+def test_middleware_is_inactive_without_listener(client, capsys):
+    assert access_log._listener is None
+    client.get("/healthz")
+    assert capsys.readouterr().out == ""
+
+
+def test_request_fields_are_logged(client, access_records, monkeypatch):
+    fetch = FixtureSource.fetch
+
+    async def fetch_with_upstream_calls(self, video_id, track):
+        count_upstream_call(0.01)
+        count_upstream_call(0.02)
+        return await fetch(self, video_id, track)
+
+    monkeypatch.setattr(FixtureSource, "fetch", fetch_with_upstream_calls)
+    url = "https://www.youtube.com/watch?v=beispiel0001"
+    assert client.post("/YTtranscript", json={"url": url}, headers=HEADERS).status_code == 200
+    assert client.post("/YTtranscript", json={"url": url}, headers=HEADERS).status_code == 200
+
+    first, second = access_records()
+    assert (first["method"], first["path"], first["status"]) == ("POST", "/YTtranscript", 200)
+    assert (first["logger"], first["level"]) == ("app.access", "INFO")
+    assert first["video_id"] == "beispiel0001"
+    assert (first["cache_hit"], first["upstream_calls"], first["upstream_ms"]) == (False, 2, 30.0)
+    assert first["duration_ms"] >= 0
+    assert second["cache_hit"] is True
+    assert "upstream_calls" not in second
+
+
+def test_error_class_is_logged_despite_sampling(client, access_records, monkeypatch):
+    monkeypatch.setattr(settings, "ACCESS_LOG_SAMPLE_RATE", 0.0)
+    client.get("/healthz")
+    response = client.post("/YTtranscript", json={"url": "https://www.youtube.com/watch?v=fehlt"}, headers=HEADERS)
+    assert response.status_code == 404
+
+    [record] = access_records()
+    assert (record["status"], record["video_id"]) == (404, "fehlt")
+    assert record["error"] == "VideoUnavailableError"
+    assert record["error_detail"]
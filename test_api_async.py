@@ -204,7 +204,7 @@ class AsyncAPITester:
                 return {
                     "test": "invalid_url",
                     "status": status,
-                    "success": status == 400,  # Erwarten 400 Bad Request
+                    "success": status == 404,  # Erwarten 404: Video nicht verfügbar
                     "execution_time": execution_time,
                     "response": result
                 }
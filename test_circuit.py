@@ -0,0 +1,64 @@
+import time
+
+from app import health
+from app.circuit import CircuitBreaker
+
+# Circuit Breaker für YouTube-Aufrufe
+
+
+def open_breaker(reset_timeout=0.05):
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=reset_timeout)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    return breaker
+
+
+def test_opens_after_threshold():
+    breaker = open_breaker()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+
+
+def test_half_open_allows_single_probe():
+    """Nach reset_timeout wird nur ein Probeaufruf zugelassen"""
+    breaker = open_breaker()
+    time.sleep(0.06)
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert [breaker.allow() for _ in range(5)] == [True, False, False, False, False]
+
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert all(breaker.allow() for _ in range(3))
+
+
+def test_failed_probe_reopens():
+    breaker = open_breaker()
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+
+    time.sleep(0.06)
+    assert breaker.allow()
+    assert not breaker.allow()
+
+
+def test_stuck_probe_is_replaced_after_reset_timeout():
+    breaker = open_breaker()
+    time.sleep(0.06)
+    assert breaker.allow()
+    time.sleep(0.06)
+    assert breaker.allow()
+    assert not breaker.allow()
+
+
+def test_open_breaker_keeps_node_ready(client, monkeypatch):
+    """Ein offener Breaker wird berichtet, nimmt den Knoten aber nicht aus der Rotation"""
+    breaker = open_breaker(reset_timeout=60)
+    monkeypatch.setattr(health, "upstream_breaker", breaker)
+    response = client.get("/readyz")
+    assert response.status_code == 200
+    assert "upstream" not in response.json()["checks"]
+    assert response.json()["circuit_breaker"]["state"] == CircuitBreaker.OPEN
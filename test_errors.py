@@ -0,0 +1,134 @@
+import asyncio
+
+import pytest
+import requests
+from youtube_transcript_api._errors import (
+    TranscriptsDisabled, NoTranscriptFound, NoTranscriptAvailable, VideoUnavailable,
+    InvalidVideoId, NotTranslatable, TranslationLanguageNotAvailable, TooManyRequests
+)
+
+from app import sources
+from app.cache import negative_cache
+from app.circuit import CircuitBreaker
+from app.config import settings
+from app.errors import (
+    TranscriptsDisabledError, TranscriptNotFoundError, VideoUnavailableError,
+    UpstreamThrottledError, UpstreamTimeoutError, UpstreamError
+)
+from app.sources import CachedSource, FixtureSource, _translate_upstream_error, call_upstream
+
+# Übersetzung der YouTube-Fehler, Breaker-Buchführung und Negativ-Cache
+HEADERS = {"X-API-Key": "test-key"}
+
+
+def http_error(status_code):
+    response = requests.Response()
+    response.status_code = status_code
+    return requests.exceptions.HTTPError(response=response)
+
+
+@pytest.mark.parametrize("library_error, expected", [
+    (TranscriptsDisabled("abc"), TranscriptsDisabledError),
+    (NoTranscriptFound("abc", ["de"], []), TranscriptNotFoundError),
+    (NoTranscriptAvailable("abc"), TranscriptNotFoundError),
+    (NotTranslatable("abc"), TranscriptNotFoundError),
+    (TranslationLanguageNotAvailable("abc"), TranscriptNotFoundError),
+    (VideoUnavailable("abc"), VideoUnavailableError),
+    (InvalidVideoId("abc"), VideoUnavailableError),
+    (TooManyRequests("abc"), UpstreamThrottledError),
+    (requests.exceptions.ReadTimeout(), UpstreamTimeoutError),
+    (http_error(429), UpstreamThrottledError),
+    (http_error(500), UpstreamError),
+    (ValueError("kaputtes XML"), UpstreamError)
+])
+def test_translate_upstream_error(library_error, expected):
+    assert type(_translate_upstream_error(library_error)) is expected
+
+
+def test_status_codes():
+    assert TranscriptsDisabledError.status_code == 404
+    assert TranscriptNotFoundError.status_code == 404
+    assert VideoUnavailableError.status_code == 404
+    assert UpstreamError.status_code == 502
+    assert UpstreamThrottledError.status_code == 503
+    assert UpstreamTimeoutError.status_code == 504
+
+
+@pytest.fixture
+def breaker(monkeypatch):
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30)
+    monkeypatch.setattr(sources, "upstream_breaker", breaker)
+    return breaker
+
+
+def raise_error(error):
+    raise error
+
+
+def test_call_upstream_counts_only_upstream_failures(breaker):
+    """Antworten von YouTube wie "Video nicht verfügbar" öffnen den Breaker nicht"""
+    for _ in range(3):
+        with pytest.raises(VideoUnavailableError):
+            call_upstream(raise_error, VideoUnavailable("abc"))
+    assert breaker.state == CircuitBreaker.CLOSED
+
+    with pytest.raises(UpstreamTimeoutError):
+        call_upstream(raise_error, requests.exceptions.ConnectTimeout())
+    assert call_upstream(lambda video_id: video_id, "abc") == "abc"
+    with pytest.raises(UpstreamError):
+        call_upstream(raise_error, http_error(500))
+    # Der erfolgreiche Aufruf dazwischen hat den Fehlerzähler zurückgesetzt
+    assert breaker.state == CircuitBreaker.CLOSED
+
+    with pytest.raises(UpstreamThrottledError):
+        call_upstream(raise_error, TooManyRequests("abc"))
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+def test_call_upstream_rejects_while_open(breaker):
+    calls = []
+    breaker.record_failure()
+    breaker.record_failure()
+    with pytest.raises(UpstreamThrottledError):
+        call_upstream(calls.append, "abc")
+    assert calls == []
+
+
+def test_retry_after_follows_breaker_reset_timeout(client, monkeypatch):
+    async def throttled(self, video_id):
+        raise UpstreamThrottledError()
+
+    monkeypatch.setattr(FixtureSource, "list_tracks", throttled)
+    monkeypatch.setattr(settings, "BREAKER_RESET_TIMEOUT", 12.5)
+    response = client.post("/YTtranscript", headers=HEADERS, json={"url": "https://www.youtube.com/watch?v=abc"})
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "13"
+    # Vorübergehende Fehler werden nicht negativ gecacht
+    assert negative_cache.get("abc") is None
+
+
+def test_unknown_video_is_negatively_cached(client):
+    """Permanente Fehler werden pro Video negativ gecacht"""
+    response = client.post("/YTtranscript", headers=HEADERS, json={"url": "https://www.youtube.com/watch?v=fehlt"})
+    assert response.status_code == 404
+    assert isinstance(negative_cache.get("fehlt"), VideoUnavailableError)
+
+
+def test_negative_cache_skips_backend(monkeypatch):
+    calls = []
+    list_tracks = FixtureSource.list_tracks
+
+    async def counting_list_tracks(self, video_id):
+        calls.append(video_id)
+        return await list_tracks(self, video_id)
+
+    monkeypatch.setattr(FixtureSource, "list_tracks", counting_list_tracks)
+    source = CachedSource(FixtureSource(settings.FIXTURE_DIR))
+
+    async def list_twice():
+        for _ in range(2):
+            with pytest.raises(VideoUnavailableError):
+                await source.list_tracks("fehlt")
+
+    asyncio.run(list_twice())
+    assert calls == ["fehlt"]
@@ -0,0 +1,37 @@
+import gzip
+import json
+
+from app.config import settings
+
+# JSONL-Export des Transcript-Stores über /admin/export
+HEADERS = {"X-API-Key": "test-key"}
+ADMIN_HEADERS = {"X-API-Key": "test-admin-key"}
+VIDEO_URL = "https://www.youtube.com/watch?v=beispiel0001"
+
+
+def test_export(client, wait_for_store_writes):
+    client.post("/YTtranscript", headers=HEADERS, json={"url": VIDEO_URL, "languages": ["de", "en"], "multi_language": True})
+    wait_for_store_writes()
+
+    response = client.get("/admin/export", headers=ADMIN_HEADERS)
+    assert response.status_code == 200
+    lines = gzip.decompress(response.content).decode("utf-8").splitlines()
+    documents = {(entry["video_id"], entry["language"]): entry for entry in map(json.loads, lines)}
+    assert documents[("beispiel0001", "de (Deutsch)")]["segments"][0] == {
+        "start": 0.0, "duration": 2.8, "text": "Willkommen zu diesem Beispielvideo."
+    }
+    assert len(documents[("beispiel0001", "en (English (auto-generated))")]["segments"]) == 3
+
+    response = client.get("/admin/export", headers=ADMIN_HEADERS, params={"compress": False})
+    assert [json.loads(line) for line in response.text.splitlines()] == [json.loads(line) for line in lines]
+
+
+def test_export_requires_admin_key(client):
+    response = client.get("/admin/export", headers=HEADERS)
+    assert response.status_code == 401
+
+
+def test_export_disabled_without_admin_key(client, monkeypatch):
+    monkeypatch.setattr(settings, "ADMIN_API_KEY", "")
+    response = client.get("/admin/export", headers=ADMIN_HEADERS)
+    assert response.status_code == 403
@@ -0,0 +1,62 @@
+import asyncio
+import logging
+import time
+
+from app import health
+from app.health import LoopLagMonitor, render_metrics
+
+# Event-Loop-Lag, Blockade-Detektor und /metrics
+
+
+def block_loop_for(seconds):
+    time.sleep(seconds)
+
+
+def run_blocking_monitor():
+    monitor = LoopLagMonitor(interval=0.01, block_threshold=0.05, debug=True)
+
+    async def run():
+        monitor.start()
+        await asyncio.sleep(0.05)
+        block_loop_for(0.2)
+        await asyncio.sleep(0.05)
+        monitor.stop()
+
+    asyncio.run(run())
+    return monitor
+
+
+def test_blocking_call_is_measured_and_reported(caplog):
+    with caplog.at_level(logging.WARNING, logger="app.health"):
+        monitor = run_blocking_monitor()
+
+    assert monitor.max_lag >= 0.15
+    assert monitor.lag_count >= 3
+    assert sum(monitor.lag_bucket_counts) == monitor.lag_count
+    assert monitor.blocked_count >= 1
+    # Der Watchdog loggt den Stack des blockierenden Codes
+    assert any("block_loop_for" in record.getMessage() for record in caplog.records)
+
+
+def test_metrics_expose_lag_histogram(client, monkeypatch):
+    monitor = run_blocking_monitor()
+    monkeypatch.setattr(health, "loop_monitor", monitor)
+
+    text = client.get("/metrics").text
+    lines = dict(line.rsplit(" ", 1) for line in text.splitlines() if not line.startswith("#"))
+    assert float(lines["event_loop_lag_max_seconds"]) >= 0.15
+    assert int(lines["event_loop_blocked_total"]) == monitor.blocked_count
+    assert int(lines['event_loop_lag_histogram_seconds_bucket{le="+Inf"}']) == monitor.lag_count
+    assert int(lines["event_loop_lag_histogram_seconds_count"]) == monitor.lag_count
+    # Die Blockade landet in einem Bucket über 0,1 s
+    assert int(lines['event_loop_lag_histogram_seconds_bucket{le="0.1"}']) < monitor.lag_count
+    assert "# TYPE event_loop_lag_histogram_seconds histogram" in text
+
+
+def test_render_metrics_groups_samples_by_type():
+    current_type = None
+    for line in render_metrics().splitlines():
+        if line.startswith("# TYPE "):
+            current_type = line.split()[2]
+        elif not line.startswith("#"):
+            assert line.split("{")[0].split(" ")[0].startswith(current_type)
@@ -0,0 +1,34 @@
+from app.sources import FixtureSource
+
+# Sprach-Endpunkt über den gecachten Sprachlisten-Aufruf
+HEADERS = {"X-API-Key": "test-key"}
+
+
+def test_languages(client):
+    response = client.get("/YTtranscript/beispiel0001/languages", headers=HEADERS)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["video_id"] == "beispiel0001"
+    assert [(entry["language_code"], entry["is_generated"]) for entry in data["languages"]] == [("de", False), ("en", True)]
+    assert data["translation_languages"] == []
+
+
+def test_languages_listing_is_cached(client, monkeypatch):
+    """Wiederholte Abfragen erreichen das Backend nur einmal"""
+    calls = []
+    list_tracks = FixtureSource.list_tracks
+
+    async def counting_list_tracks(self, video_id):
+        calls.append(video_id)
+        return await list_tracks(self, video_id)
+
+    monkeypatch.setattr(FixtureSource, "list_tracks", counting_list_tracks)
+    for _ in range(3):
+        assert client.get("/YTtranscript/beispiel0001/languages", headers=HEADERS).status_code == 200
+    client.post("/YTtranscript", headers=HEADERS, json={"url": "https://www.youtube.com/watch?v=beispiel0001"})
+    assert calls == ["beispiel0001"]
+
+
+def test_languages_unknown_video(client):
+    response = client.get("/YTtranscript/fehlt/languages", headers=HEADERS)
+    assert response.status_code == 404
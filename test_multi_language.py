@@ -0,0 +1,61 @@
+import asyncio
+
+from app.cache import CompactTranscript
+from app.endpoints.YTtranscript import LoadTranscript
+from app.sources import CachedSource, TranscriptSource, TranscriptTrack
+
+# Mehrere Sprachen und Übersetzungen in einem Request
+HEADERS = {"X-API-Key": "test-key"}
+VIDEO_URL = "https://www.youtube.com/watch?v=beispiel0001"
+
+
+class TranslatingSource(TranscriptSource):
+    """Quelle mit einer deutschen Spur, die nach Französisch übersetzbar ist"""
+
+    def __init__(self):
+        self.list_calls = 0
+        self.fetched = []
+
+    async def list_tracks(self, video_id):
+        self.list_calls += 1
+        return [TranscriptTrack(
+            "de", "Deutsch", is_translatable=True,
+            translation_languages=[{"language_code": "fr", "language": "French"}]
+        )]
+
+    async def fetch(self, video_id, track):
+        self.fetched.append((track.language_code, track.translated_from))
+        text = "bonjour" if track.translated_from else "hallo"
+        return CompactTranscript.from_segments(video_id, track.label, [{"text": text, "start": 0.0, "duration": 1.0}])
+
+
+def test_multi_language(client):
+    """Alle angefragten Sprachen im Feld transcripts"""
+    response = client.post("/YTtranscript", headers=HEADERS, json={
+        "url": VIDEO_URL, "languages": ["de", "en"], "multi_language": True
+    })
+    assert response.status_code == 200
+    data = response.json()
+    assert data["language"] == "de (Deutsch)"
+    transcripts = data["transcripts"]
+    assert [entry["language"] for entry in transcripts] == ["de (Deutsch)", "en (English (auto-generated))"]
+    assert transcripts[1]["transcript"].startswith("welcome to this example video")
+
+
+def test_multi_language_missing_language(client):
+    response = client.post("/YTtranscript", headers=HEADERS, json={
+        "url": VIDEO_URL, "languages": ["de", "fr"], "multi_language": True
+    })
+    assert response.status_code == 404
+
+
+def test_missing_language_is_translated():
+    """Nicht vorhandene Sprachen werden als Übersetzung geladen; ein Listing für alle"""
+    source = TranslatingSource()
+    loader = LoadTranscript(VIDEO_URL, ["de", "fr", "de"], multi_language=True, source=CachedSource(source))
+    result = asyncio.run(loader.run())
+    assert [(entry["language"], entry["transcript"]) for entry in result["transcripts"]] == [
+        ("de (Deutsch)", "hallo"), ("fr (French)", "bonjour")
+    ]
+    assert source.list_calls == 1
+    assert sorted(source.fetched) == [("de", None), ("fr", "de")]
@@ -0,0 +1,151 @@
+import asyncio
+
+from app.cache import CompactTranscript, pipeline_cache
+from app.endpoints import YTtranscript
+from app.endpoints.YTtranscript import LoadTranscript
+from app.pipeline import MAX_MERGED_CHARS, chunk, dedupe, merge_lines, run_pipeline, strip_tags
+from app.sources import TranscriptTrack
+
+# Tests für die Nachbearbeitungs-Pipeline (Stufen, Chunking, Cache)
+
+
+def make_compact(texts, duration=1.0):
+    segments = ({"text": text, "start": index * duration, "duration": duration} for index, text in enumerate(texts))
+    return CompactTranscript.from_segments("abc", "en", segments)
+
+
+def test_strip_tags_keeps_timing_of_remaining_segments():
+    """Tag-Segmente am Anfang und Ende dürfen die Zeitstempel nicht verschieben"""
+    texts, starts, durations = strip_tags(
+        ["[Music]", "hello  >> world", "[Applause] ♪", "bye ♪♪", "[Music]"],
+        [0.0, 5.0, 9.0, 10.0, 12.0],
+        [5.0, 4.0, 1.0, 2.0, 3.0]
+    )
+    assert texts == ["hello world", "bye"]
+    assert starts == [5.0, 10.0]
+    assert durations == [4.0, 2.0]
+
+
+def test_strip_tags_separator_in_text():
+    """Das interne Trennzeichen im Segmenttext verschiebt keine Zeitstempel"""
+    texts, starts, _ = strip_tags(["a\x1eb", "[Music]", "c\x1e"], [0.0, 1.0, 2.0], [1.0, 1.0, 1.0])
+    assert texts == ["a b", "c"]
+    assert starts == [0.0, 2.0]
+
+
+def test_strip_tags_empty():
+    assert strip_tags([], [], []) == ([], [], [])
+
+
+def test_dedupe_rolling_captions():
+    """Wiederholte Segmente werden verschmolzen, wiederholte Anfänge entfernt"""
+    texts, starts, durations = dedupe(
+        ["we are going", "we are going", "are going to the park", "to the park today", "the end", "end of it"],
+        [0.0, 1.0, 2.0, 3.0, 4.0, 5.0],
+        [1.0, 1.0, 1.0, 1.0, 1.0, 1.0]
+    )
+    # Ein einzelnes wiederholtes Wort ("end") ist keine Wiederholung
+    assert texts == ["we are going", "to the park", "today", "the end", "end of it"]
+    assert starts == [0.0, 2.0, 3.0, 4.0, 5.0]
+    assert durations == [2.0, 1.0, 1.0, 1.0, 1.0]
+
+
+def test_dedupe_segment_contained_in_previous_extends_it():
+    texts, starts, durations = dedupe(["one two three", "two three"], [0.0, 1.0], [1.0, 2.0])
+    assert (texts, starts, durations) == (["one two three"], [0.0], [3.0])
+
+
+def test_merge_lines_until_sentence_end():
+    texts, starts, durations = merge_lines(
+        ["this is a", "sentence. and", "another one!", "trailing"],
+        [0.0, 1.0, 2.0, 3.0],
+        [1.0, 1.0, 1.5, 1.0]
+    )
+    assert texts == ["this is a sentence. and another one!", "trailing"]
+    assert starts == [0.0, 3.0]
+    assert durations == [3.5, 1.0]
+
+
+def test_merge_lines_stops_at_max_merged_chars():
+    part = "x" * 100
+    count = MAX_MERGED_CHARS // len(part) + 2
+    texts, starts, _ = merge_lines([part] * count, list(range(count)), [1.0] * count)
+    first_length = MAX_MERGED_CHARS // len(part)
+    assert texts[0] == " ".join([part] * first_length)
+    assert starts == [0, first_length]
+    assert len(texts) == 2
+
+
+def test_chunk_without_overlap():
+    compact = make_compact(["abcdefgh"] * 5)
+    chunks = chunk(compact, chunk_tokens=4)
+    assert [item["tokens"] for item in chunks] == [4, 4, 2]
+    assert [(item["start"], item["end"]) for item in chunks] == [(0.0, 2.0), (2.0, 4.0), (4.0, 5.0)]
+    assert chunks[0]["text"] == "abcdefgh abcdefgh"
+
+
+def test_chunk_with_overlap():
+    compact = make_compact(["abcdefgh"] * 7)
+    chunks = chunk(compact, chunk_tokens=6, chunk_overlap=2)
+    assert [(item["start"], item["end"]) for item in chunks] == [(0.0, 3.0), (2.0, 5.0), (4.0, 7.0)]
+
+
+def test_chunk_overlap_not_smaller_than_chunk_tokens_terminates():
+    """Auch bei chunk_overlap >= chunk_tokens schreitet jeder Chunk voran"""
+    compact = make_compact(["abcdefgh"] * 6)
+    chunks = chunk(compact, chunk_tokens=4, chunk_overlap=10)
+    starts = [item["start"] for item in chunks]
+    assert starts == sorted(set(starts))
+    assert chunks[-1]["end"] == 6.0
+    assert len(chunks) == 5
+
+
+def test_chunk_oversized_segment_forms_own_chunk():
+    compact = make_compact(["kurz", "x" * 100, "kurz"])
+    chunks = chunk(compact, chunk_tokens=5)
+    assert [item["tokens"] for item in chunks] == [1, 25, 1]
+
+
+def test_run_pipeline_applies_stages_in_order():
+    compact = make_compact(["[Music]", "we are", "we are going", "home."])
+    processed = run_pipeline(compact, ["strip_tags", "dedupe", "merge_lines"])
+    assert list(processed.iter_segments()) == [(1.0, 3.0, "we are going home.")]
+    assert (processed.video_id, processed.language) == ("abc", "en")
+
+
+class StaticSource:
+    def __init__(self, compact):
+        self.compact = compact
+
+    async def list_tracks(self, video_id):
+        return [TranscriptTrack("en", "English")]
+
+    async def fetch(self, video_id, track):
+        return self.compact
+
+
+def test_pipeline_results_are_cached(monkeypatch):
+    """Nachbearbeitung und Chunking laufen pro Video, Sprache und Optionen nur einmal"""
+    pipeline_cache.clear()
+    calls = []
+
+    def counting_run_pipeline(compact, stages):
+        calls.append(tuple(stages))
+        return run_pipeline(compact, stages)
+
+    monkeypatch.setattr(YTtranscript, "run_pipeline", counting_run_pipeline)
+    source = StaticSource(make_compact(["[Music]", "hello there.", "general kenobi."]))
+
+    def load(**options):
+        loader = LoadTranscript("https://www.youtube.com/watch?v=abc", ["en"], source=source, **options)
+        return asyncio.run(loader.run())
+
+    first = load(postprocess=["strip_tags"], chunk_tokens=4)
+    second = load(postprocess=["strip_tags"], chunk_tokens=4)
+    assert first == second
+    assert first["transcript"] == "hello there.\ngeneral kenobi."
+    assert [item["start"] for item in first["chunks"]] == [1.0, 2.0]
+    assert calls == [("strip_tags",)]
+
+    load(postprocess=["strip_tags", "merge_lines"])
+    assert calls == [("strip_tags",), ("strip_tags", "merge_lines")]
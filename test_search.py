@@ -0,0 +1,58 @@
+from app.cache import CompactTranscript
+from app.store import TranscriptStore
+
+# Volltextsuche über die im Store indexierten Fixture-Transcripts
+HEADERS = {"X-API-Key": "test-key"}
+VIDEO_URL = "https://www.youtube.com/watch?v=beispiel0001"
+
+
+def load_both_languages(client, wait_for_store_writes):
+    client.post("/YTtranscript", headers=HEADERS, json={"url": VIDEO_URL, "languages": ["de", "en"], "multi_language": True})
+    wait_for_store_writes()
+
+
+def test_search_all_terms(client, wait_for_store_writes):
+    """Alle Begriffe müssen im selben Segment vorkommen"""
+    load_both_languages(client, wait_for_store_writes)
+    response = client.get("/search", headers=HEADERS, params={"q": "fixture transcript"})
+    hits = response.json()["hits"]
+    assert {(hit["video_id"], hit["language"]) for hit in hits} == {
+        ("beispiel0001", "de (Deutsch)"), ("beispiel0001", "en (English (auto-generated))")
+    }
+    assert all(hit["score"] == 1 for hit in hits)
+
+
+def test_phrase_search(client, wait_for_store_writes):
+    load_both_languages(client, wait_for_store_writes)
+    response = client.get("/search", headers=HEADERS, params={"q": "lokalen fixture", "phrase": True})
+    hits = response.json()["hits"]
+    assert [(hit["video_id"], hit["language"]) for hit in hits] == [("beispiel0001", "de (Deutsch)")]
+    assert hits[0]["matches"] == [
+        {"segment": 1, "start": 2.8, "text": "Dieses Transcript stammt aus einer lokalen Fixture-Datei."}
+    ]
+
+    response = client.get("/search", headers=HEADERS, params={"q": "fixture lokalen", "phrase": True})
+    assert response.json()["hits"] == []
+
+
+def test_search_limit(client, wait_for_store_writes):
+    load_both_languages(client, wait_for_store_writes)
+    response = client.get("/search", headers=HEADERS, params={"q": "fixture", "limit": 1})
+    assert len(response.json()["hits"]) == 1
+
+
+def test_store_ranks_by_matches_and_limits_segments(tmp_path):
+    """Bewertung, Limit und max_matches werden in SQL angewendet"""
+    store = TranscriptStore(str(tmp_path / "store.db"))
+    for video_id, matching in (("wenig", 2), ("viel", 6), ("keins", 0)):
+        segments = [
+            {"text": "hallo welt" if index < matching else "etwas anderes", "start": float(index), "duration": 1.0}
+            for index in range(8)
+        ]
+        store.add(CompactTranscript.from_segments(video_id, "de", segments))
+
+    hits = store.search("welt hallo", limit=2, max_matches=3)
+    assert [(hit["video_id"], hit["score"]) for hit in hits] == [("viel", 6), ("wenig", 2)]
+    assert [match["segment"] for match in hits[0]["matches"]] == [0, 1, 2]
+    assert store.search("hallo welt", limit=1)[0]["video_id"] == "viel"
+    assert store.search("unbekannt") == []
@@ -0,0 +1,178 @@
+import asyncio
+import time
+
+import pytest
+
+from app.cache import CompactTranscript
+from app.config import settings
+from app.errors import TranscriptNotFoundError
+from app.shared_cache import InMemoryRedis, SingleFlightLock
+from app.sources import SharedCacheSource, TranscriptTrack
+
+# Tests für den geteilten Cache gegen den lokalen Ersatz InMemoryRedis
+
+SEGMENTS = [
+    {"text": "Grüße aus dem Cache", "start": 0.0, "duration": 1.5},
+    {"text": "zweite Zeile ♪", "start": 1.5, "duration": 2.25},
+    {"text": "", "start": 3.75, "duration": 0.5}
+]
+
+
+class CountingSource:
+    """Innere Quelle, die ihre Abrufe zählt und optional verzögert oder fehlschlägt"""
+
+    def __init__(self, delay=0.0, error=None):
+        self.delay = delay
+        self.error = error
+        self.fetches = 0
+
+    async def list_tracks(self, video_id):
+        return [TranscriptTrack("de", "Deutsch"), TranscriptTrack("en", "English", is_generated=True)]
+
+    async def fetch(self, video_id, track):
+        self.fetches += 1
+        await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return CompactTranscript.from_segments(video_id, track.label, SEGMENTS)
+
+
+def make_source(inner, client, lock_timeout=3.0):
+    return SharedCacheSource(inner, client, ttl=60, lock_timeout=lock_timeout, error_ttl=5)
+
+
+def test_compact_transcript_round_trip():
+    compact = CompactTranscript.from_segments("abc", "de (Deutsch)", SEGMENTS)
+    restored = CompactTranscript.from_bytes(compact.to_bytes())
+    assert (restored.video_id, restored.language) == ("abc", "de (Deutsch)")
+    assert list(restored.iter_segments()) == list(compact.iter_segments())
+    assert restored.text == compact.text
+
+    empty = CompactTranscript.from_bytes(CompactTranscript.from_segments("abc", "de", []).to_bytes())
+    assert len(empty) == 0
+
+
+def test_in_memory_redis():
+    async def run():
+        client = InMemoryRedis()
+        assert await client.set("a", "1")
+        assert await client.set("a", "2", nx=True) is None
+        assert await client.get("a") == b"1"
+        await client.set("b", b"x", px=20)
+        assert await client.mget(["a", "b", "c"]) == [b"1", b"x", None]
+        await asyncio.sleep(0.05)
+        assert await client.get("b") is None
+        assert await client.delete("a", "c") == 1
+        assert await client.get("a") is None
+
+    asyncio.run(run())
+
+
+def test_lock_release_keeps_foreign_lock():
+    """Eine abgelaufene Sperre darf die Sperre eines anderen Knotens nicht löschen"""
+    async def run():
+        client = InMemoryRedis()
+        first = SingleFlightLock(client, "lock", 0.02)
+        second = SingleFlightLock(client, "lock", 5)
+        assert await first.acquire()
+        assert not await second.acquire()
+        await asyncio.sleep(0.05)
+        assert await second.acquire()
+        await first.release()
+        assert await client.get("lock") == second.token
+        await second.release()
+        assert await client.get("lock") is None
+
+    asyncio.run(run())
+
+
+def test_shared_hits_skip_inner_source():
+    """Ein Knoten lädt, ein zweiter liest beide Sprachen aus dem geteilten Cache"""
+    async def run():
+        client = InMemoryRedis()
+        first_inner, second_inner = CountingSource(), CountingSource()
+        first, second = make_source(first_inner, client), make_source(second_inner, client)
+        tracks = await first.list_tracks("abc")
+        loaded = await first.fetch_many("abc", tracks)
+        cached = await second.fetch_many("abc", await second.list_tracks("abc"))
+        assert [compact.text for compact in cached] == [compact.text for compact in loaded]
+        assert (first_inner.fetches, second_inner.fetches) == (2, 0)
+
+    asyncio.run(run())
+
+
+def test_single_flight_across_nodes():
+    """Gleichzeitige Abrufe mehrerer Knoten erreichen die Quelle nur einmal"""
+    async def run():
+        client = InMemoryRedis()
+        inner = CountingSource(delay=0.1)
+        sources = [make_source(inner, client) for _ in range(3)]
+        track = TranscriptTrack("de", "Deutsch")
+        results = await asyncio.gather(*(source.fetch("abc", track) for source in sources for _ in range(3)))
+        assert inner.fetches == 1
+        assert len({compact.text for compact in results}) == 1
+
+    asyncio.run(run())
+
+
+def test_waiters_get_error_of_lock_holder():
+    """Schlägt der Abruf des Sperrinhabers fehl, erhalten Wartende sofort denselben Fehler"""
+    async def run():
+        client = InMemoryRedis()
+        inner = CountingSource(delay=0.1, error=TranscriptNotFoundError("Nicht vorhanden"))
+        first, second = make_source(inner, client), make_source(inner, client)
+        track = TranscriptTrack("de", "Deutsch")
+
+        async def fetch(source):
+            with pytest.raises(TranscriptNotFoundError, match="Nicht vorhanden"):
+                await source.fetch("abc", track)
+
+        started = time.monotonic()
+        await asyncio.gather(fetch(first), fetch(second))
+        assert time.monotonic() - started < 1.0
+        assert inner.fetches == 1
+
+    asyncio.run(run())
+
+
+def test_waiter_fetches_after_lock_released_without_result():
+    """Wird die Sperre ohne Wert und Fehlermarke freigegeben, lädt der Wartende selbst"""
+    async def run():
+        client = InMemoryRedis()
+        inner = CountingSource()
+        source = make_source(inner, client, lock_timeout=30)
+        track = TranscriptTrack("de", "Deutsch")
+        lock = SingleFlightLock(client, f"lock:{source._transcript_key('abc', track)}", 30)
+        assert await lock.acquire()
+
+        async def release_soon():
+            await asyncio.sleep(0.1)
+            await lock.release()
+
+        started = time.monotonic()
+        compact, _ = await asyncio.gather(source.fetch("abc", track), release_soon())
+        assert time.monotonic() - started < 1.0
+        assert len(compact) == len(SEGMENTS)
+        assert inner.fetches == 1
+
+    asyncio.run(run())
+
+
+def test_listing_expires_with_listing_ttl():
+    """Sprachlisten verfallen nach listing_ttl, Transcripts erst nach ttl"""
+    async def run():
+        client = InMemoryRedis()
+        inner = CountingSource()
+        source = SharedCacheSource(inner, client, ttl=60, lock_timeout=3.0, listing_ttl=0.02)
+        tracks = await source.list_tracks("abc")
+        await source.fetch("abc", tracks[0])
+        await asyncio.sleep(0.05)
+        assert await client.get("yt:tracks:abc") is None
+        assert await client.get(source._transcript_key("abc", tracks[0])) is not None
+
+    asyncio.run(run())
+
+
+def test_listing_ttl_defaults_to_listing_cache_ttl():
+    source = SharedCacheSource(CountingSource(), InMemoryRedis(), ttl=60, lock_timeout=3.0)
+    assert source.listing_ttl == settings.LISTING_CACHE_TTL
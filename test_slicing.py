@@ -0,0 +1,35 @@
+# Zeitfenster, Segment- und Zeichen-Pagination über den Fixture-Transcripts
+HEADERS = {"X-API-Key": "test-key"}
+VIDEO_URL = "https://www.youtube.com/watch?v=beispiel0001"
+
+
+def test_time_window(client):
+    """Zeitfenster per Binärsuche über die Segment-Startzeiten"""
+    response = client.post("/YTtranscript", headers=HEADERS, json={
+        "url": VIDEO_URL, "start": 3.0, "end": 10.0, "include_segments": True
+    })
+    data = response.json()
+    assert data["total_segments"] == 2
+    assert [segment["start"] for segment in data["segments"]] == [2.8, 6.4]
+
+
+def test_segment_pagination(client):
+    response = client.post("/YTtranscript", headers=HEADERS, json={"url": VIDEO_URL, "offset": 1, "limit": 1})
+    data = response.json()
+    assert data["transcript"] == "Dieses Transcript stammt aus einer lokalen Fixture-Datei."
+    assert data["next_offset"] == 2
+
+    response = client.post("/YTtranscript", headers=HEADERS, json={"url": VIDEO_URL, "offset": 2})
+    assert response.json()["next_offset"] is None
+
+
+def test_char_pagination(client):
+    response = client.post("/YTtranscript", headers=HEADERS, json={"url": VIDEO_URL, "char_offset": 0, "char_limit": 10})
+    data = response.json()
+    assert data["transcript"] == "Willkommen"
+    assert data["next_char_offset"] == 10
+
+
+def test_negative_offset_is_rejected(client):
+    response = client.post("/YTtranscript", headers=HEADERS, json={"url": VIDEO_URL, "offset": -1})
+    assert response.status_code == 422
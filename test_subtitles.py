@@ -0,0 +1,43 @@
+from app.cache import CompactTranscript
+from app.subtitles import CUES_PER_CHUNK, iter_srt, iter_vtt
+
+# SRT/WebVTT-Ausgabe aus den gecachten Segmenten
+HEADERS = {"X-API-Key": "test-key"}
+VIDEO_URL = "https://www.youtube.com/watch?v=beispiel0001"
+
+
+def test_srt_output(client):
+    response = client.post("/YTtranscript", headers=HEADERS, json={"url": VIDEO_URL, "format": "srt", "limit": 2})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-subrip")
+    assert response.headers["content-disposition"] == 'attachment; filename="beispiel0001.srt"'
+    assert response.text == (
+        "1\n00:00:00,000 --> 00:00:02,800\nWillkommen zu diesem Beispielvideo.\n\n"
+        "2\n00:00:02,800 --> 00:00:06,400\nDieses Transcript stammt aus einer lokalen Fixture-Datei.\n\n"
+    )
+
+
+def test_vtt_output(client):
+    response = client.post("/YTtranscript", headers=HEADERS, json={"url": VIDEO_URL, "format": "vtt", "start": 6.4})
+    assert response.headers["content-type"].startswith("text/vtt")
+    assert response.text == (
+        "WEBVTT\n\n"
+        "00:00:06.400 --> 00:00:09.800\nEs wird für Tests und Benchmarks ohne Netzwerk verwendet.\n\n"
+    )
+
+
+def test_writer_streams_in_chunks():
+    segments = [{"text": f"Zeile {index}\n\nmit Leerzeile", "start": index * 3661.5, "duration": 1.0} for index in range(250)]
+    compact = CompactTranscript.from_segments("abc", "de", segments)
+    chunks = list(iter_srt(compact))
+    assert len(chunks) == -(-250 // CUES_PER_CHUNK)
+    # Leerzeilen im Text würden den Cue beenden
+    assert "2\n01:01:01,500 --> 01:01:02,500\nZeile 1\nmit Leerzeile\n\n" in chunks[0]
+    assert "".join(iter_vtt(compact, 249)).endswith("Zeile 249\nmit Leerzeile\n\n")
+
+
+def test_arrows_in_text_are_escaped():
+    """"-->" im Text darf keine Zeitstempel-Zeile vortäuschen"""
+    compact = CompactTranscript.from_segments("abc", "en", [{"text": "x --> y & <b>", "start": 0.0, "duration": 1.0}])
+    assert "".join(iter_srt(compact)) == "1\n00:00:00,000 --> 00:00:01,000\nx -> y & <b>\n\n"
+    assert "".join(iter_vtt(compact)) == "WEBVTT\n\n00:00:00.000 --> 00:00:01.000\nx --&gt; y &amp; &lt;b&gt;\n\n"
@@ -0,0 +1,81 @@
+import asyncio
+
+from app.config import settings
+from app.sources import CachedSource, FixtureSource, StoreSource
+from app.store import TranscriptStore
+
+# Tests gegen die Fixture-Transcripts in fixtures/ (siehe conftest.py), ohne Netzwerk
+HEADERS = {"X-API-Key": "test-key"}
+VIDEO_URL = "https://www.youtube.com/watch?v=beispiel0001"
+
+
+class CountingFixtureSource(FixtureSource):
+    """Fixture-Quelle, die ihre Aufrufe zählt"""
+
+    def __init__(self, directory):
+        super().__init__(directory)
+        self.calls = {"list_tracks": 0, "fetch": 0}
+
+    async def list_tracks(self, video_id):
+        self.calls["list_tracks"] += 1
+        return await super().list_tracks(video_id)
+
+    async def fetch(self, video_id, track):
+        self.calls["fetch"] += 1
+        return await super().fetch(video_id, track)
+
+
+def test_transcript_from_fixture(client):
+    """Liefert das bevorzugte Transcript aus der Fixture-Datei"""
+    response = client.post("/YTtranscript", headers=HEADERS, json={"url": VIDEO_URL})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["video_id"] == "beispiel0001"
+    assert data["language"] == "de (Deutsch)"
+    assert data["total_segments"] == 3
+    assert data["transcript"].startswith("Willkommen zu diesem Beispielvideo.")
+
+
+def test_language_preference(client):
+    """Bevorzugte Sprachen werden in der angegebenen Reihenfolge gewählt"""
+    response = client.post("/YTtranscript", headers=HEADERS, json={"url": VIDEO_URL, "languages": ["en", "de"]})
+    assert response.json()["language"] == "en (English (auto-generated))"
+
+
+def test_without_api_key(client):
+    response = client.post("/YTtranscript", json={"url": VIDEO_URL})
+    assert response.status_code == 401
+
+
+def test_invalid_url(client):
+    response = client.post("/YTtranscript", headers=HEADERS, json={"url": "https://www.youtube.com/"})
+    assert response.status_code == 400
+
+
+def test_source_chain_caches_and_stores(tmp_path, wait_for_store_writes):
+    """Cache → Store → Backend: wiederholte Abrufe erreichen das Backend nicht"""
+    store = TranscriptStore(str(tmp_path / "store.db"))
+    backend = CountingFixtureSource(settings.FIXTURE_DIR)
+    source = CachedSource(StoreSource(backend, store))
+
+    async def fetch_twice():
+        for _ in range(2):
+            tracks = await source.list_tracks("beispiel0001")
+            await source.fetch("beispiel0001", tracks[0])
+
+    asyncio.run(fetch_twice())
+    assert backend.calls == {"list_tracks": 1, "fetch": 1}
+
+    wait_for_store_writes()
+    stored = store.load("beispiel0001", "de (Deutsch)")
+    assert len(stored) == 3
+
+    # Ohne In-Process-Cache kommt das Transcript aus dem Store
+    store_only = StoreSource(backend, store)
+
+    async def fetch_from_store():
+        tracks = await store_only.list_tracks("beispiel0001")
+        return await store_only.fetch("beispiel0001", tracks[0])
+
+    assert asyncio.run(fetch_from_store()).text == stored.text
+    assert backend.calls["fetch"] == 1
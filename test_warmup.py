@@ -0,0 +1,109 @@
+import asyncio
+import time
+
+import pytest
+
+from app import warmup
+from app.health import readiness_report
+from app.store import AccessCounter, TranscriptStore
+from app.warmup import warm_cache, warmup_state
+
+# Cache-Warm-up beim Start, Readiness währenddessen und das gesammelte Zugriffslog
+
+
+@pytest.fixture
+def restore_warmup_state():
+    saved = dict(vars(warmup_state))
+    yield
+    vars(warmup_state).update(saved)
+
+
+class RecordingLoader:
+    """Ersatz für LoadTranscript, der Startzeiten und Parallelität aufzeichnet"""
+
+    starts = []
+    active = 0
+    max_active = 0
+    ready_during_load = []
+
+    def __init__(self, url):
+        self.url = url
+
+    async def load(self, video_id):
+        cls = RecordingLoader
+        cls.starts.append(time.monotonic())
+        cls.active += 1
+        cls.max_active = max(cls.max_active, cls.active)
+        cls.ready_during_load.append(readiness_report()["checks"]["warmup"])
+        try:
+            await asyncio.sleep(0.1)
+            if video_id == "kaputt":
+                raise RuntimeError("Abruf fehlgeschlagen")
+        finally:
+            cls.active -= 1
+
+    @classmethod
+    def reset(cls):
+        cls.starts, cls.active, cls.max_active, cls.ready_during_load = [], 0, 0, []
+
+
+def test_warm_cache_limits_concurrency_and_rate(monkeypatch, restore_warmup_state):
+    RecordingLoader.reset()
+    monkeypatch.setattr(warmup, "LoadTranscript", RecordingLoader)
+    video_ids = [f"video{index}" for index in range(5)] + ["kaputt"]
+
+    asyncio.run(warm_cache(video_ids, concurrency=2, rate=40))
+
+    assert RecordingLoader.max_active == 2
+    gaps = [later - earlier for earlier, later in zip(RecordingLoader.starts, RecordingLoader.starts[1:])]
+    assert min(gaps) >= 1 / 40 * 0.9
+    assert (warmup_state.status, warmup_state.total, warmup_state.loaded, warmup_state.failed) == ("done", 6, 5, 1)
+    assert warmup_state.as_dict()["duration"] > 0
+
+
+def test_rate_spaces_starts(monkeypatch, restore_warmup_state):
+    RecordingLoader.reset()
+    monkeypatch.setattr(warmup, "LoadTranscript", RecordingLoader)
+
+    started = time.monotonic()
+    asyncio.run(warm_cache(["a", "b", "c", "d"], concurrency=4, rate=10))
+
+    # Vier Starts im Abstand von 0,1 s, auch wenn alle gleichzeitig laufen dürften
+    assert RecordingLoader.starts[-1] - started >= 0.27
+    assert RecordingLoader.max_active >= 2
+
+
+def test_not_ready_until_warmup_done(client, monkeypatch, restore_warmup_state):
+    RecordingLoader.reset()
+    monkeypatch.setattr(warmup, "LoadTranscript", RecordingLoader)
+
+    asyncio.run(warm_cache(["a", "b"], concurrency=1, rate=100))
+    assert RecordingLoader.ready_during_load == [False, False]
+    assert client.get("/readyz").status_code == 200
+
+    monkeypatch.setattr(warmup_state, "status", "running")
+    response = client.get("/readyz")
+    assert response.status_code == 503
+    assert response.json()["checks"]["warmup"] is False
+
+
+def test_warm_cache_with_fixture_backend(restore_warmup_state):
+    asyncio.run(warm_cache(["beispiel0001", "fehlt"], concurrency=2, rate=100))
+    assert (warmup_state.loaded, warmup_state.failed) == (1, 1)
+
+
+def test_access_counter_flushes_in_batches(tmp_path):
+    store = TranscriptStore(str(tmp_path / "store.db"))
+    counter = AccessCounter(store)
+    for video_id in ["a", "b", "a", "a", "c", "b"]:
+        counter.hit(video_id)
+    assert store.top_videos(3) == []
+
+    counter.flush()
+    assert store.top_videos(2) == ["a", "b"]
+
+    for _ in range(5):
+        counter.hit("c")
+    counter.flush()
+    counter.flush()
+    assert store.top_videos(1) == ["c"]